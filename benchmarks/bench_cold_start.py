@@ -0,0 +1,186 @@
+"""Measure the cold start of the MCP server.
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_cold_start --runs 5
+
+Two measurements are made, each in fresh interpreters since imports are cached per process:
+
+- `python -X importtime -c "import server"`, summed per top-level package, which shows where
+  the import time of the server goes;
+- the server run over stdio, like MCP clients spawn it, driven with raw JSON-RPC messages: the
+  time from launching the process until it has answered the handshake and listed its tools
+  ("ready"), then the latency of its first tool call. Clients rarely call a tool right after the
+  handshake, so the call is made after --think-time seconds, during which the server warms up in
+  the background.
+
+The server talks to a local mock of the Readwise API (through READWISE_API_URL) answering
+instantly, so the figures only include the server's own work.
+
+Timings are medians over the runs.
+"""
+
+# Standard Library
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, Dict, List
+
+BOOK = {
+    "id": 1,
+    "title": "Deep Work",
+    "author": "Cal Newport",
+    "category": "books",
+    "source": "kindle",
+    "num_highlights": 1,
+    "last_highlight_at": "2025-01-01T00:00:00Z",
+    "updated": "2025-01-01T00:00:00Z",
+    "cover_image_url": "https://example.com/cover.png",
+    "highlights_url": "https://readwise.io/bookreview/1",
+}
+
+
+class MockReadwiseHandler(BaseHTTPRequestHandler):
+    """Answers the auth check with a 204 and any list request with a single book."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/api/v2/auth/"):
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"count": 1, "next": None, "results": [BOOK]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def import_times() -> Dict[str, float]:
+    """Return the import time of `server`, and the self import time of each top-level package, in ms."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"], capture_output=True, text=True, check=True
+    )
+    times: Dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (field.strip() for field in line[len("import time:") :].split("|"))
+        times[name.split(".")[0]] += int(self_us) / 1000
+        if name == "server":
+            times["(total)"] = int(cumulative_us) / 1000
+    return times
+
+
+def send(stdin: IO[str], message: Dict[str, Any]) -> None:
+    stdin.write(json.dumps({"jsonrpc": "2.0", **message}) + "\n")
+    stdin.flush()
+
+
+def receive(stdout: IO[str], request_id: int) -> Dict[str, Any]:
+    """Read messages until the response to a request, skipping notifications."""
+    for line in stdout:
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Request {request_id} failed: {message['error']}")
+            return message
+    raise RuntimeError(f"Server exited before answering request {request_id}")
+
+
+def launch_times(api_url: str, think_time: float) -> Dict[str, float]:
+    """Launch the server over stdio and return the time until it is ready and its first call latency, in ms."""
+    env = dict(os.environ, READWISE_API_URL=api_url, READWISE_API_KEY="bench-key")
+    env.pop("READWISE_SNAPSHOT_DIR", None)
+    env.pop("READWISE_CACHE_PATH", None)
+
+    launched_at = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import server; server.mcp.run(show_banner=False)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    try:
+        client_info = {"name": "bench_cold_start", "version": "1.0"}
+        initialize = {"protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": client_info}
+        send(process.stdin, {"id": 1, "method": "initialize", "params": initialize})
+        receive(process.stdout, 1)
+        send(process.stdin, {"method": "notifications/initialized"})
+        send(process.stdin, {"id": 2, "method": "tools/list"})
+        receive(process.stdout, 2)
+        ready = (time.perf_counter() - launched_at) * 1000
+
+        time.sleep(think_time)
+
+        started_at = time.perf_counter()
+        arguments = {"document_categories": ["books"]}
+        send(
+            process.stdin,
+            {
+                "id": 3,
+                "method": "tools/call",
+                "params": {"name": "list_readwise_documents_by_filters", "arguments": arguments},
+            },
+        )
+        response = receive(process.stdout, 3)
+        first_call = (time.perf_counter() - started_at) * 1000
+        if response["result"].get("isError"):
+            raise RuntimeError(f"First tool call failed: {response['result']}")
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    return {"ready": ready, "first_call": first_call}
+
+
+def median_by_key(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = {key for sample in samples for key in sample}
+    return {key: statistics.median(sample.get(key, 0.0) for sample in samples) for key in keys}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Number of packages to list")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Seconds between the handshake and the call")
+    args = parser.parse_args()
+
+    imports = median_by_key([import_times() for _ in range(args.runs)])
+    print(f"import server: {imports.pop('(total)'):.0f} ms, of which")
+    for package, ms in sorted(imports.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"  {package:<20} {ms:7.1f} ms")
+
+    mock_api = ThreadingHTTPServer(("127.0.0.1", 0), MockReadwiseHandler)
+    threading.Thread(target=mock_api.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{mock_api.server_address[1]}/api/v2"
+    try:
+        launches = median_by_key([launch_times(api_url, args.think_time) for _ in range(args.runs)])
+    finally:
+        mock_api.shutdown()
+
+    print(f"From launch to server ready: {launches['ready']:.0f} ms")
+    print(f"First tool call latency:     {launches['first_call']:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Measure the trigram index on a synthetic library.
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_fuzzy_lookup --books 10000
+
+Reports the time to build the index over every title and author, the time to apply a
+single-book update, and the latency of near-miss queries (punctuation removed, subtitle
+left out, typo), both ranked by `search_books` and resolved by name by `find_books_by_titles`,
+along with how many found the right book.
+"""
+
+# Standard Library
+import argparse
+import random
+import string
+import time
+
+# Internal Libraries
+from readwise_mcp.cache.library import LibraryCache
+from tests.readwise_mcp.factories import make_book_json
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(3000)]
+
+    def words(count: int) -> str:
+        return " ".join(rng.choice(vocabulary) for _ in range(count)).title()
+
+    books = [
+        make_book_json(book_id, f"{words(3)}, {words(1)}: {words(4)}", author=words(2))
+        for book_id in range(1, args.books + 1)
+    ]
+    library = LibraryCache()
+    library.apply_books(books)
+
+    start = time.perf_counter()
+    library.fuzzy_index
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    library.apply_books([make_book_json(args.books + 1, words(5))])
+    update_seconds = time.perf_counter() - start
+
+    def near_miss(title: str) -> str:
+        main_title = title.split(":")[0].replace(",", "")
+        position = rng.randrange(len(main_title))
+        return main_title[:position] + main_title[position + 1 :]
+
+    targets = rng.sample(books, args.queries)
+    queries = [near_miss(book["title"]) for book in targets]
+
+    start = time.perf_counter()
+    results = [library.fuzzy_index.search(query, limit=1) for query in queries]
+    search_seconds = (time.perf_counter() - start) / len(queries)
+
+    hits = sum(1 for book, result in zip(targets, results) if result and result[0][0] == book["id"])
+
+    start = time.perf_counter()
+    resolved = [library.find_books_by_titles([query])[query] for query in queries]
+    find_seconds = (time.perf_counter() - start) / len(queries)
+
+    found = sum(1 for book, result in zip(targets, resolved) if result and result.id == book["id"])
+
+    print(
+        f"{args.books} books: index built in {build_seconds * 1000:.0f} ms, one update in {update_seconds * 1e6:.0f} us"
+    )
+    print(f"Near-miss searches: {search_seconds * 1e6:.0f} us each, {hits}/{len(queries)} ranked the right book first")
+    print(f"Near-miss names:    {find_seconds * 1e6:.0f} us each, {found}/{len(queries)} resolved to the right book")
+
+
+if __name__ == "__main__":
+    main()
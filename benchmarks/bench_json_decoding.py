@@ -0,0 +1,123 @@
+"""Benchmark JSON backends and content encodings on synthetic pages of 1000 highlights.
+
+Run from the project root (install the `fast` extra to include orjson and brotli):
+
+    uv run --extra fast python -m benchmarks.bench_json_decoding
+
+For each available JSON backend, the page is decoded in full, as done for cached pages,
+snapshot sections and single-object responses. The incremental parser used for streamed
+pages is measured alongside. For each content encoding, the transferred size and the CPU
+time to decompress the page in 64 KiB chunks, as httpx does while streaming, are reported.
+"""
+
+# Standard Library
+import argparse
+import gzip
+import json
+import random
+import string
+import time
+import zlib
+from typing import Callable, Dict, List
+
+# Internal Libraries
+from readwise_mcp.utils import json_codec
+from readwise_mcp.utils.json_stream import JSONStreamParser
+from tests.readwise_mcp.factories import make_highlight_json
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_page(num_records: int) -> bytes:
+    # Random words keep the page from compressing unrealistically well
+    rng = random.Random(42)
+    vocabulary = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(5000)]
+    records = [
+        make_highlight_json(
+            highlight_id,
+            book_id=highlight_id % 40,
+            text=" ".join(rng.choices(vocabulary, k=60)),
+            tags=["ai", "reading"][: highlight_id % 3],
+        )
+        for highlight_id in range(num_records)
+    ]
+    return json.dumps({"count": num_records, "next": None, "results": records}).encode("utf-8")
+
+
+def json_decoders() -> Dict[str, Callable[[bytes], object]]:
+    decoders: Dict[str, Callable[[bytes], object]] = {"json (stdlib)": json.loads}
+    if json_codec.orjson is not None:
+        decoders["orjson"] = json_codec.orjson.loads
+    if json_codec.msgspec is not None:
+        decoders["msgspec"] = json_codec.msgspec.json.decode
+
+    def incremental(body: bytes) -> object:
+        parser = JSONStreamParser("results")
+        for i in range(0, len(body), CHUNK_SIZE):
+            parser.feed(body[i : i + CHUNK_SIZE])
+        return parser.close()
+
+    decoders["incremental (stdlib)"] = incremental
+    return decoders
+
+
+def chunked_gunzip(data: bytes) -> int:
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    return sum(len(decompressor.decompress(data[i : i + CHUNK_SIZE])) for i in range(0, len(data), CHUNK_SIZE))
+
+
+def encodings(body: bytes) -> Dict[str, tuple]:
+    """Return the compressed body and a chunked decompressor for each available encoding."""
+    result = {"identity": (body, lambda data: len(data)), "gzip": (gzip.compress(body, 6), chunked_gunzip)}
+    try:
+        # Third Party
+        import brotli
+    except ImportError:
+        return result
+
+    def chunked_unbrotli(data: bytes) -> int:
+        decompressor = brotli.Decompressor()
+        return sum(len(decompressor.process(data[i : i + CHUNK_SIZE])) for i in range(0, len(data), CHUNK_SIZE))
+
+    result["br"] = (brotli.compress(body, quality=5), chunked_unbrotli)
+    return result
+
+
+def timed(fn: Callable, argument, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(argument)
+    return (time.perf_counter() - start) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = build_page(args.records)
+    print(
+        f"Page of {args.records} highlights: {len(body) / 1024:.0f} KiB of JSON (active backend: {json_codec.BACKEND})"
+    )
+
+    print("\nDecoding")
+    baseline = None
+    for name, decode in json_decoders().items():
+        seconds = timed(decode, body, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {name:<22} {seconds * 1000:7.2f} ms/page  ({baseline / seconds:.1f}x)")
+
+    print("\nTransfer")
+    rows: List[str] = []
+    for name, (data, decompress) in encodings(body).items():
+        seconds = timed(decompress, data, args.repeat)
+        rows.append(
+            f"  {name:<10} {len(data) / 1024:8.0f} KiB  ({len(body) / len(data):4.1f}x smaller)"
+            f"  decompress {seconds * 1000:6.2f} ms/page"
+        )
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compare buffered and incremental parsing of a 1000-highlight page.
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_page_streaming
+
+The buffered path mirrors `response.json()`: the whole body is accumulated, then decoded at
+once. The incremental path feeds the same body in network-sized chunks to JSONStreamParser.
+The iter_records path serves the body through a mock transport to `iter_records`, with an
+empty response cache, so it includes the HTTP client and the caching of the page. With the
+`fast` extra installed, it buffers the page and decodes it with msgspec instead of parsing it
+incrementally (see `common.STREAM_PAGES`). Every path
+converts each record to a Highlight as soon as it is decoded. Peak memory is measured with
+tracemalloc.
+"""
+
+# Standard Library
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import AsyncIterator, Callable, List
+
+# Third Party
+import httpx
+
+# Internal Libraries
+from readwise_mcp.cache.backends import InMemoryCacheBackend
+from readwise_mcp.tools.readwise import common
+from readwise_mcp.tools.readwise.tenants import TenantRegistry
+from readwise_mcp.types.highlight import Highlight
+from readwise_mcp.utils.json_stream import JSONStreamParser
+from tests.readwise_mcp.factories import make_highlight_json
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_page(num_records: int) -> List[bytes]:
+    records = [
+        make_highlight_json(highlight_id, book_id=1, text=f"Highlight number {highlight_id} " * 20, tags=["ai"])
+        for highlight_id in range(num_records)
+    ]
+    body = json.dumps({"count": num_records, "next": None, "results": records}).encode("utf-8")
+    return [body[i : i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+
+
+def buffered(chunks: List[bytes]) -> int:
+    count = 0
+    for record in json.loads(b"".join(chunks))["results"]:
+        Highlight(**record)
+        count += 1
+    return count
+
+
+def incremental(chunks: List[bytes]) -> int:
+    parser = JSONStreamParser("results")
+    count = 0
+    for chunk in chunks:
+        for record in parser.feed(chunk):
+            Highlight(**record)
+            count += 1
+    parser.close()
+    return count
+
+
+class ChunkStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: List[bytes]):
+        self.chunks = chunks
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            yield chunk
+
+
+def streamed(chunks: List[bytes]) -> int:
+    async def walk() -> int:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=ChunkStream(chunks)))
+        common.TENANTS = TenantRegistry(transport=transport)
+        common.set_response_cache(InMemoryCacheBackend())
+        count = 0
+        try:
+            async for record in common.iter_records("bench-key", f"{common.READWISE_API_URL}/highlights/"):
+                Highlight(**record)
+                count += 1
+        finally:
+            await common.TENANTS.aclose()
+        return count
+
+    return asyncio.run(walk())
+
+
+def measure(name: str, fn: Callable[[List[bytes]], int], chunks: List[bytes], repeat: int) -> None:
+    tracemalloc.start()
+    fn(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(chunks)
+    elapsed = (time.perf_counter() - start) / repeat
+
+    print(f"{name:<12} {elapsed * 1000:8.1f} ms/page   peak {peak / 1024 / 1024:6.2f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = build_page(args.records)
+    print(f"Page of {args.records} highlights, {sum(len(c) for c in chunks) / 1024 / 1024:.2f} MiB")
+    measure("buffered", buffered, chunks, args.repeat)
+    measure("incremental", incremental, chunks, args.repeat)
+    measure("iter_records", streamed, chunks, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
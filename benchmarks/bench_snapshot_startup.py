@@ -0,0 +1,113 @@
+"""Compare a cold start with a snapshot-backed start for a synthetic 100k-highlight library.
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_snapshot_startup
+
+The cold start replays every `/books/` and `/highlights/` page through JSON decoding and the
+library indexes, which is the CPU side of a full sync; a real cold start additionally pays one
+API round-trip plus DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS per page, which is reported too.
+"""
+
+# Standard Library
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+# Internal Libraries
+from readwise_mcp.cache.library import LibraryCache
+from readwise_mcp.cache.snapshot import load_snapshot, save_snapshot
+from readwise_mcp.tools.readwise.common import DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS
+from readwise_mcp.tools.readwise.pagination import PAGE_SIZES
+from tests.readwise_mcp.factories import make_book_json, make_highlight_json
+
+TAGS = ["ai", "history", "philosophy", "startups", "writing", "science", "health", "economics"]
+
+
+def build_pages(num_books: int, num_highlights: int, page_size: int) -> Dict[str, List[bytes]]:
+    """Build raw API pages (as bytes) for a synthetic library."""
+    books = [
+        make_book_json(book_id, f"Synthetic Book {book_id}", author=f"Author {book_id % 500}")
+        for book_id in range(1, num_books + 1)
+    ]
+    highlights = [
+        make_highlight_json(
+            highlight_id,
+            book_id=(highlight_id % num_books) + 1,
+            text=f"Highlight number {highlight_id} " * 8,
+            tags=[TAGS[highlight_id % len(TAGS)]],
+        )
+        for highlight_id in range(1, num_highlights + 1)
+    ]
+
+    def paginate(records: List[Dict]) -> List[bytes]:
+        return [
+            json.dumps({"count": len(records), "next": None, "results": records[i : i + page_size]}).encode("utf-8")
+            for i in range(0, len(records), page_size)
+        ]
+
+    return {"books": paginate(books), "highlights": paginate(highlights)}
+
+
+def cold_start(pages: Dict[str, List[bytes]]) -> LibraryCache:
+    library = LibraryCache()
+    for page in pages["books"]:
+        library.apply_books(json.loads(page)["results"])
+    for page in pages["highlights"]:
+        library.apply_highlights(json.loads(page)["results"])
+    return library
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--books", type=int, default=2_000)
+    parser.add_argument("--highlights", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZES[-1])
+    args = parser.parse_args()
+
+    pages = build_pages(args.books, args.highlights, args.page_size)
+    num_pages = len(pages["books"]) + len(pages["highlights"])
+
+    start = time.perf_counter()
+    library = cold_start(pages)
+    library.find_books_by_titles(["Synthetic Book 42"])
+    library.get_highlights_by_book(42)
+    cold_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "library.snapshot")
+
+        start = time.perf_counter()
+        save_snapshot(library, path)
+        save_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = load_snapshot(path)
+        load_seconds = time.perf_counter() - start
+
+        title_seconds = timed(restored.find_books_by_titles, ["Synthetic Book 42"])
+        highlights_seconds = timed(restored.get_highlights_by_book, 42)
+
+        snapshot_bytes = os.path.getsize(path)
+
+    print(f"Library: {args.books} books, {args.highlights} highlights, {num_pages} pages of {args.page_size}")
+    print(f"Cold start (decode + index + first queries): {cold_seconds * 1000:.1f} ms")
+    print(f"  + {num_pages} API round-trips and >= {num_pages * DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS} s of sleeps")
+    print(f"Snapshot size: {snapshot_bytes / 1024 / 1024:.1f} MiB, written in {save_seconds * 1000:.1f} ms")
+    print(f"Snapshot start: load {load_seconds * 1000:.2f} ms")
+    print(f"  first title lookup (decodes books + title index): {title_seconds * 1000:.1f} ms")
+    print(f"  first highlight lookup (decodes highlights): {highlights_seconds * 1000:.1f} ms")
+    print("  + 2 delta-sync round-trips")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Simulate many tenants sharing one server instance.
+
+Run from the project root:
+
+    uv run python -m benchmarks.bench_tenants --tenants 100
+
+Each quiet tenant sends a few sequential requests through `get_data` while a noisy tenant
+floods the server with concurrent requests. The upstream API is simulated with a fixed
+latency. The benchmark reports the request latency of the quiet tenants with and without the
+noisy one, the throughput the noisy tenant was held to, and checks that every response was
+served with the API key of the tenant that asked for it.
+
+Every request asks for a distinct URL and every run starts with an empty response cache, so
+that all requests reach the rate limiters and the simulated API instead of being cache hits.
+"""
+
+# Standard Library
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import List
+
+# Third Party
+import httpx
+
+# Internal Libraries
+from readwise_mcp.cache.backends import InMemoryCacheBackend
+from readwise_mcp.tools.readwise import common
+from readwise_mcp.tools.readwise.tenants import TenantRegistry
+
+URL = "https://readwise.io/api/v2/books/"
+
+# Numbers the requests so that they all miss the response cache
+REQUEST_IDS = itertools.count()
+
+
+def make_transport(latency: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json={"token": request.headers["Authorization"], "results": []})
+
+    return httpx.MockTransport(handler)
+
+
+async def quiet_tenant(api_key: str, num_requests: int, latencies: List[float]) -> int:
+    leaks = 0
+    for _ in range(num_requests):
+        start = time.perf_counter()
+        response = await common.get_data(api_key, URL, {"request": next(REQUEST_IDS)})
+        latencies.append(time.perf_counter() - start)
+        if response["token"] != f"Token {api_key}":
+            leaks += 1
+    return leaks
+
+
+async def noisy_tenant(api_key: str, concurrency: int, completed: List[int]) -> None:
+    async def worker() -> None:
+        while True:
+            await common.get_data(api_key, URL, {"request": next(REQUEST_IDS)})
+            completed[0] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run(num_tenants: int, num_requests: int, noisy_concurrency: int, latency: float) -> None:
+    for with_noise in (False, True):
+        common.TENANTS = TenantRegistry(transport=make_transport(latency))
+        common.set_response_cache(InMemoryCacheBackend())
+        latencies: List[float] = []
+        completed = [0]
+
+        noisy_task = (
+            asyncio.create_task(noisy_tenant("noisy-key", noisy_concurrency, completed)) if with_noise else None
+        )
+        start = time.perf_counter()
+        leaks = await asyncio.gather(
+            *(quiet_tenant(f"tenant-key-{index}", num_requests, latencies) for index in range(num_tenants))
+        )
+        elapsed = time.perf_counter() - start
+        if noisy_task:
+            noisy_task.cancel()
+            await asyncio.gather(noisy_task, return_exceptions=True)
+        await common.TENANTS.aclose()
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(f"{'With' if with_noise else 'Without'} noisy tenant:")
+        print(f"  {num_tenants} quiet tenants x {num_requests} requests in {elapsed:.2f} s")
+        print(f"  quiet latency p50 {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+        print(f"  cross-tenant leaks: {sum(leaks)}")
+        if with_noise:
+            print(f"  noisy tenant ({noisy_concurrency} workers) held to {completed[0] / elapsed:.1f} requests/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenants", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--noisy-concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated upstream latency in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.tenants, args.requests, args.noisy_concurrency, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# This file makes the cache directory a proper Python package.
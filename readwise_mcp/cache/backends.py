@@ -0,0 +1,222 @@
+# Standard Library
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator, Dict, List, Optional, Tuple
+
+# How long a refresh lock is held at most, in case its owner dies without releasing it
+LOCK_TIMEOUT_IN_SECONDS = 30
+
+LOCK_POLL_INTERVAL_IN_SECONDS = 0.05
+
+MAX_IN_MEMORY_ENTRIES = 10_000
+
+# Bound on the total size of the values cached in memory, since a single page can weigh megabytes
+MAX_IN_MEMORY_BYTES = 128 * 1024 * 1024
+
+# Entries expired anywhere in memory are purged once every this many writes
+IN_MEMORY_PURGE_EVERY_N_WRITES = 100
+
+# Expired entries are purged from SQLite once every this many writes
+SQLITE_PURGE_EVERY_N_WRITES = 100
+
+
+class CacheBackend(ABC):
+    """Key-value store for cached API responses, with a lock per key.
+
+    The lock lets a single caller refresh a missing or expired key while the others wait for
+    its result instead of all hitting the Readwise API.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value of a key, or None if it is missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for `ttl` seconds."""
+
+    @abstractmethod
+    async def delete_prefix(self, prefix: str) -> None:
+        """Delete all keys starting with a prefix."""
+
+    @abstractmethod
+    def lock(self, key: str, timeout: float = LOCK_TIMEOUT_IN_SECONDS) -> AsyncContextManager[None]:
+        """Context manager holding the refresh lock of a key.
+
+        If the lock cannot be acquired within `timeout` seconds, the context is entered anyway so
+        that a stuck owner never blocks callers forever.
+        """
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Cache local to the current process, bounded in number of entries and in bytes.
+
+    Expired entries are purged as new ones are written, and the oldest entries are evicted first.
+    """
+
+    def __init__(self, max_entries: int = MAX_IN_MEMORY_ENTRIES, max_bytes: int = MAX_IN_MEMORY_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+        self._bytes = 0
+        self._writes = 0
+        # Lock and number of holders or waiters of each key, dropped once nobody uses it
+        self._locks: Dict[str, List] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._delete(key)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.monotonic()
+        self._delete(key)
+        self._entries[key] = (now + ttl, value)
+        self._bytes += len(value)
+
+        self._writes += 1
+        if self._writes % IN_MEMORY_PURGE_EVERY_N_WRITES == 0:
+            for expired_key in [key for key, (expires_at, _) in self._entries.items() if expires_at < now]:
+                self._delete(expired_key)
+
+        # Entries are kept in insertion order, so the first ones are the oldest. With the usual
+        # single TTL they also expire first, and are dropped here without scanning the others.
+        while self._entries:
+            oldest_key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at >= now and len(self._entries) <= self.max_entries and self._bytes <= self.max_bytes:
+                break
+            self._delete(oldest_key)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._delete(key)
+
+    def _delete(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    @asynccontextmanager
+    async def lock(self, key: str, timeout: float = LOCK_TIMEOUT_IN_SECONDS) -> AsyncIterator[None]:
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        lock = entry[0]
+        entry[1] += 1
+        try:
+            try:
+                await asyncio.wait_for(lock.acquire(), timeout)
+                acquired = True
+            except asyncio.TimeoutError:
+                logging.warning(f"Timed out waiting for the cache lock of {key}")
+                acquired = False
+            try:
+                yield
+            finally:
+                if acquired:
+                    lock.release()
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache shared by all the processes of a host through a SQLite database in WAL mode.
+
+    Several server replicas pointing at the same file share fetched responses, and the lock
+    table makes sure only one of them refreshes a given key at a time. Queries can wait up to
+    10 seconds on another process holding the database, so they run in worker threads, one at a
+    time, rather than on the event loop.
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._writes = 0
+        # Serializes the use of the connection across worker threads
+        self._connection_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._connection_lock:
+            row = self._connection.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._connection_lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", (key, value, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % SQLITE_PURGE_EVERY_N_WRITES == 0:
+                self._connection.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+
+    def _execute(self, sql: str, parameters: Tuple) -> int:
+        with self._connection_lock:
+            return self._connection.execute(sql, parameters).rowcount
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def _try_acquire(self, key: str, owner: str) -> bool:
+        now = time.time()
+        with self._connection_lock:
+            # Take over locks whose owner did not release them in time
+            self._connection.execute("DELETE FROM locks WHERE key = ? AND expires_at < ?", (key, now))
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO locks (key, owner, expires_at) VALUES (?, ?, ?)",
+                (key, owner, now + LOCK_TIMEOUT_IN_SECONDS),
+            )
+            return cursor.rowcount == 1
+
+    @asynccontextmanager
+    async def lock(self, key: str, timeout: float = LOCK_TIMEOUT_IN_SECONDS) -> AsyncIterator[None]:
+        # Unique per acquisition, so that releasing never drops a lock taken over by someone else
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        acquired = await asyncio.to_thread(self._try_acquire, key, owner)
+        while not acquired and time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL_IN_SECONDS)
+            acquired = await asyncio.to_thread(self._try_acquire, key, owner)
+
+        if not acquired:
+            logging.warning(f"Timed out waiting for the cache lock of {key}")
+        try:
+            yield
+        finally:
+            if acquired:
+                await asyncio.to_thread(self._execute, "DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner))
+
+    def close(self) -> None:
+        with self._connection_lock:
+            self._connection.close()
@@ -0,0 +1,421 @@
+# Standard Library
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Internal Libraries
+from readwise_mcp.cache.trigram import TrigramIndex
+from readwise_mcp.tools.readwise.common import READWISE_API_URL, get_count, iter_records
+from readwise_mcp.types.book import Book, BookMatch
+from readwise_mcp.types.highlight import Highlight
+
+# Minimum time between two delta syncs of the same library
+SYNC_INTERVAL_IN_SECONDS = 60
+
+# Maximum time between two full syncs of an endpoint, which drop the records deleted upstream
+FULL_SYNC_INTERVAL_IN_SECONDS = 24 * 60 * 60
+
+SECTION_NAMES = ("books", "highlights", "title_index", "tag_index")
+
+SYNCED_ENDPOINTS = ("books", "highlights")
+
+# Minimum similarity of a title to a name for it to stand in for a missing exact title
+FUZZY_MATCH_MIN_SIMILARITY = 0.5
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp as returned by the Readwise API."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class LibraryCache:
+    """In-memory copy of a Readwise library, with a title index and a tag index.
+
+    Records are kept as the raw JSON dictionaries returned by the API and only turned into
+    `Book` / `Highlight` models when a query returns them. Each section can be provided as a
+    loader callable, in which case it is only materialised on first access; this is how
+    snapshots are loaded lazily (see `readwise_mcp.cache.snapshot`).
+
+    The watermarks hold the most recent `updated` timestamp seen per endpoint, so that a sync
+    only fetches records changed since then. Deletions are not reported by the Readwise v2
+    delta filters, so after each delta sync the number of cached records is compared with the
+    count reported by the API. On a mismatch, and at least every FULL_SYNC_INTERVAL_IN_SECONDS,
+    the endpoint is synced in full and the records missing from the API are dropped. This also
+    recovers records that a delta walk skipped because the data changed between two pages.
+
+    Book titles and authors are also indexed by trigrams for fuzzy lookups. That index is not
+    snapshotted: it is built from the books on first use and kept up to date afterwards.
+    """
+
+    def __init__(
+        self,
+        sections: Optional[Dict[str, Any | Callable[[], Any]]] = None,
+        watermarks: Optional[Dict[str, Optional[str]]] = None,
+        on_corrupt: Optional[Callable[[], None]] = None,
+        full_synced_at: Optional[Dict[str, Optional[float]]] = None,
+    ):
+        sections = sections or {}
+        self._on_corrupt = on_corrupt
+        self._sections: Dict[str, Any] = {}
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        for name in SECTION_NAMES:
+            value = sections.get(name)
+            if callable(value):
+                self._loaders[name] = value
+            else:
+                self._sections[name] = value if value is not None else {}
+
+        self.watermarks: Dict[str, Optional[str]] = {"books": None, "highlights": None}
+        self.watermarks.update(watermarks or {})
+        # Wall-clock time of the last full sync per endpoint, kept in snapshots
+        self.full_synced_at: Dict[str, Optional[float]] = {"books": None, "highlights": None}
+        self.full_synced_at.update(full_synced_at or {})
+
+        self._book_highlights: Optional[Dict[int, List[int]]] = None
+        self._fuzzy_index: Optional[TrigramIndex] = None
+        self._last_synced_at: Dict[str, float] = {}
+        self._sync_lock = asyncio.Lock()
+
+    def _section(self, name: str) -> Any:
+        """Return a section, materialising it from its loader on first access.
+
+        If the loader fails (e.g. the snapshot behind it is corrupt), the whole library is
+        discarded, since its sections would no longer agree with each other.
+        """
+        if name not in self._sections:
+            try:
+                self._sections[name] = self._loaders[name]()
+            except Exception as e:
+                logging.error(f"Discarding the library: its {name} section cannot be loaded ({e})")
+                self._discard()
+            else:
+                del self._loaders[name]
+        return self._sections[name]
+
+    def _discard(self) -> None:
+        """Empty the library and reset its watermarks, so that its next sync fetches everything again."""
+        self._loaders.clear()
+        self._sections = {name: {} for name in SECTION_NAMES}
+        self.watermarks = {"books": None, "highlights": None}
+        self.full_synced_at = {"books": None, "highlights": None}
+        self._book_highlights = None
+        self._fuzzy_index = None
+        self._last_synced_at.clear()
+        if self._on_corrupt is not None:
+            on_corrupt, self._on_corrupt = self._on_corrupt, None
+            on_corrupt()
+
+    def copy_sections(self) -> Dict[str, Any]:
+        """Return a copy of the sections that later updates of the library leave untouched.
+
+        Records are shared with the library since updates replace them rather than modify them.
+        Sections that were never accessed are not loaded: their loader is returned instead.
+        """
+        copies = {
+            "books": lambda books: dict(books),
+            "highlights": lambda highlights: dict(highlights),
+            "title_index": lambda index: {title: list(ids) for title, ids in index.items()},
+            "tag_index": lambda index: {tag: list(ids) for tag, ids in index.items()},
+        }
+        return {
+            name: self._loaders[name] if name in self._loaders else copy(self._sections[name])
+            for name, copy in copies.items()
+        }
+
+    @property
+    def books(self) -> Dict[int, Dict]:
+        return self._section("books")
+
+    @property
+    def highlights(self) -> Dict[int, Dict]:
+        return self._section("highlights")
+
+    @property
+    def title_index(self) -> Dict[str, List[int]]:
+        return self._section("title_index")
+
+    @property
+    def tag_index(self) -> Dict[str, List[int]]:
+        return self._section("tag_index")
+
+    def apply_books(self, books_json: Iterable[Dict]) -> int:
+        """Insert or update raw book records, keeping the title index in sync."""
+        count = 0
+        for book_json in books_json:
+            book_id = book_json["id"]
+            previous = self.books.get(book_id)
+            if previous is not None:
+                self._unindex(self.title_index, previous["title"].lower(), book_id)
+            self.books[book_id] = book_json
+            self.title_index.setdefault(book_json["title"].lower(), []).append(book_id)
+            if self._fuzzy_index is not None:
+                self._index_book(book_json, self._fuzzy_index)
+            self._advance_watermark("books", book_json.get("updated"))
+            count += 1
+        return count
+
+    def apply_highlights(self, highlights_json: Iterable[Dict]) -> int:
+        """Insert or update raw highlight records, keeping the tag index in sync."""
+        count = 0
+        for highlight_json in highlights_json:
+            highlight_id = highlight_json["id"]
+            previous = self.highlights.get(highlight_id)
+            if previous is not None:
+                for tag in previous.get("tags") or []:
+                    self._unindex(self.tag_index, tag["name"], highlight_id)
+                if self._book_highlights is not None:
+                    self._unindex(self._book_highlights, previous["book_id"], highlight_id)
+            self.highlights[highlight_id] = highlight_json
+            for tag in highlight_json.get("tags") or []:
+                self.tag_index.setdefault(tag["name"], []).append(highlight_id)
+            if self._book_highlights is not None:
+                self._book_highlights.setdefault(highlight_json["book_id"], []).append(highlight_id)
+            self._advance_watermark("highlights", highlight_json.get("updated"))
+            count += 1
+        return count
+
+    def set_highlight_tags(self, highlight_id: int, tags: List[Dict]) -> None:
+        """Replace the tags of a cached highlight after they were changed through the API.
+
+        Highlights missing from the cache are ignored; the next sync will fetch them.
+        """
+        highlight_json = self.highlights.get(highlight_id)
+        if highlight_json is not None:
+            self.apply_highlights([{**highlight_json, "tags": tags}])
+
+    def remove_books(self, book_ids: Iterable[int]) -> int:
+        """Drop books from the cache and its indexes, e.g. once they were deleted upstream."""
+        count = 0
+        for book_id in book_ids:
+            book_json = self.books.pop(book_id, None)
+            if book_json is None:
+                continue
+            self._unindex(self.title_index, book_json["title"].lower(), book_id)
+            if self._fuzzy_index is not None:
+                self._fuzzy_index.remove(book_id)
+            count += 1
+        return count
+
+    def remove_highlights(self, highlight_ids: Iterable[int]) -> int:
+        """Drop highlights from the cache and its indexes, e.g. once they were deleted upstream."""
+        count = 0
+        for highlight_id in highlight_ids:
+            highlight_json = self.highlights.pop(highlight_id, None)
+            if highlight_json is None:
+                continue
+            for tag in highlight_json.get("tags") or []:
+                self._unindex(self.tag_index, tag["name"], highlight_id)
+            if self._book_highlights is not None:
+                self._unindex(self._book_highlights, highlight_json["book_id"], highlight_id)
+            count += 1
+        return count
+
+    @staticmethod
+    def _unindex(index: Dict, key: Any, record_id: int) -> None:
+        ids = index.get(key)
+        if ids and record_id in ids:
+            ids.remove(record_id)
+            if not ids:
+                del index[key]
+
+    def _advance_watermark(self, endpoint: str, updated: Optional[str]) -> None:
+        current = self.watermarks.get(endpoint)
+        if updated and (current is None or parse_timestamp(updated) > parse_timestamp(current)):
+            self.watermarks[endpoint] = updated
+
+    async def sync(self, api_key: str, endpoints: Tuple[str, ...] = SYNCED_ENDPOINTS, force: bool = False) -> bool:
+        """Fetch the records updated since the last watermarks.
+
+        Args:
+            api_key (str): The Readwise API key.
+            endpoints (Tuple[str, ...]): The endpoints to sync, among "books" and "highlights".
+            force (bool): Sync endpoints even if their last sync happened less than
+                SYNC_INTERVAL_IN_SECONDS ago.
+
+        Returns:
+            bool: True if any record was added, updated or removed.
+        """
+
+        async with self._sync_lock:
+            changed = 0
+            for endpoint in endpoints:
+                last_synced_at = self._last_synced_at.get(endpoint)
+                if (
+                    not force
+                    and last_synced_at is not None
+                    and time.monotonic() - last_synced_at < SYNC_INTERVAL_IN_SECONDS
+                ):
+                    continue
+
+                changed += await self._sync_endpoint(api_key, endpoint)
+                self._last_synced_at[endpoint] = time.monotonic()
+
+            if changed:
+                logging.info(f"Library sync applied {changed} changed records. Watermarks: {self.watermarks}")
+            return changed > 0
+
+    def invalidate(self, endpoints: Tuple[str, ...] = SYNCED_ENDPOINTS) -> None:
+        """Make the next sync of the given endpoints hit the API, even within SYNC_INTERVAL_IN_SECONDS."""
+        for endpoint in endpoints:
+            self._last_synced_at.pop(endpoint, None)
+
+    async def _sync_endpoint(self, api_key: str, endpoint: str) -> int:
+        url = f"{READWISE_API_URL}/{endpoint}/"
+        full_synced_at = self.full_synced_at.get(endpoint)
+        if (
+            self.watermarks.get(endpoint) is None
+            or full_synced_at is None
+            or time.time() - full_synced_at >= FULL_SYNC_INTERVAL_IN_SECONDS
+        ):
+            return await self._full_sync_endpoint(api_key, endpoint)
+
+        params = {"updated__gt": self.watermarks[endpoint]}
+        records = [record async for record in iter_records(api_key, url, params)]
+        changed = self._appliers[endpoint](records)
+
+        count = await get_count(api_key, url)
+        cached_count = len(getattr(self, endpoint))
+        if count == cached_count:
+            return changed
+
+        logging.warning(f"Syncing {endpoint} in full: the API counts {count} records, the cache {cached_count}")
+        return changed + await self._full_sync_endpoint(api_key, endpoint)
+
+    async def _full_sync_endpoint(self, api_key: str, endpoint: str) -> int:
+        records = [record async for record in iter_records(api_key, f"{READWISE_API_URL}/{endpoint}/")]
+        fetched_ids = {record["id"] for record in records}
+        deleted_ids = [record_id for record_id in getattr(self, endpoint) if record_id not in fetched_ids]
+
+        removed = self._removers[endpoint](deleted_ids)
+        if removed:
+            logging.info(f"Dropped {removed} {endpoint} deleted upstream")
+        self.full_synced_at[endpoint] = time.time()
+        return removed + self._appliers[endpoint](records)
+
+    @property
+    def _appliers(self) -> Dict[str, Callable[[Iterable[Dict]], int]]:
+        return {"books": self.apply_books, "highlights": self.apply_highlights}
+
+    @property
+    def _removers(self) -> Dict[str, Callable[[Iterable[int]], int]]:
+        return {"books": self.remove_books, "highlights": self.remove_highlights}
+
+    @property
+    def fuzzy_index(self) -> TrigramIndex:
+        if self._fuzzy_index is None:
+            self._fuzzy_index = self._build_fuzzy_index(list(self.books.values()))
+        return self._fuzzy_index
+
+    async def build_fuzzy_index(self) -> None:
+        """Build the fuzzy index in a worker thread, so that the event loop keeps running.
+
+        Indexing takes up to a couple of seconds per 10k books. Books updated while the index is being built
+        are indexed again once it is done.
+        """
+        if self._fuzzy_index is not None:
+            return
+
+        books = list(self.books.values())
+        index = await asyncio.to_thread(self._build_fuzzy_index, books)
+        if self._fuzzy_index is not None:
+            # Built by someone else in the meantime
+            return
+
+        indexed = {book_json["id"]: book_json for book_json in books}
+        for book_id in indexed.keys() - self.books.keys():
+            index.remove(book_id)
+        for book_id, book_json in self.books.items():
+            if indexed.get(book_id) is not book_json:
+                self._index_book(book_json, index)
+        self._fuzzy_index = index
+
+    @classmethod
+    def _build_fuzzy_index(cls, books_json: List[Dict]) -> TrigramIndex:
+        index = TrigramIndex()
+        for book_json in books_json:
+            cls._index_book(book_json, index)
+        return index
+
+    @staticmethod
+    def _index_book(book_json: Dict, index: TrigramIndex) -> None:
+        """Index a book under its title and, if it has one, its title without the subtitle as names."""
+        title = book_json["title"]
+        names = [title]
+        main_title = title.split(":", 1)[0].strip()
+        if main_title and main_title != title:
+            names.append(main_title)
+        index.add(book_json["id"], *names, f"{title} {book_json.get('author') or ''}", num_names=len(names))
+
+    def find_books_by_titles(self, document_names: List[str]) -> Dict[str, Optional[Book]]:
+        """Look up books by their title.
+
+        Exact (case-insensitive) titles are looked up first. Names without an exact match
+        resolve to the most similar title, or title without its subtitle, provided their trigram
+        Jaccard similarity is at least FUZZY_MATCH_MIN_SIMILARITY. Unlike `search_books`, partial
+        names such as an author or a single word of the title do not resolve.
+        """
+        results: Dict[str, Optional[Book]] = {}
+        for name in document_names:
+            book_ids = self.title_index.get(name.lower())
+            if book_ids:
+                results[name] = Book(**self.books[book_ids[0]])
+                continue
+
+            match = self.fuzzy_index.match(name, min_similarity=FUZZY_MATCH_MIN_SIMILARITY)
+            if match:
+                book_id, similarity = match
+                logging.info(f"Resolved '{name}' to '{self.books[book_id]['title']}' (similarity {similarity:.2f})")
+                results[name] = Book(**self.books[book_id])
+            else:
+                results[name] = None
+        return results
+
+    def search_books(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[BookMatch]:
+        """Return the books whose title or author best match a query, best first."""
+        return [
+            BookMatch(book=Book(**self.books[book_id]), score=round(score, 3))
+            for book_id, score in self.fuzzy_index.search(query, limit=limit, min_score=min_score)
+        ]
+
+    def get_highlights_by_book(self, book_id: int) -> List[Highlight]:
+        """Return all highlights of a book."""
+        if self._book_highlights is None:
+            self._book_highlights = {}
+            for highlight_id, highlight_json in self.highlights.items():
+                self._book_highlights.setdefault(highlight_json["book_id"], []).append(highlight_id)
+
+        return [Highlight(**self.highlights[h_id]) for h_id in self._book_highlights.get(book_id, [])]
+
+    def get_highlights_by_filters(
+        self,
+        from_date: Optional[date],
+        to_date: Optional[date],
+        tag_names: List[str],
+    ) -> List[Highlight]:
+        """Return highlights within a date range and/or carrying at least one of the tags."""
+
+        if not from_date and not to_date and not tag_names:
+            raise ValueError("At least one filter must be provided")
+
+        if tag_names:
+            candidate_ids = sorted({h_id for tag in tag_names for h_id in self.tag_index.get(tag, [])})
+        else:
+            candidate_ids = list(self.highlights.keys())
+
+        highlights: List[Highlight] = []
+        for highlight_id in candidate_ids:
+            highlight_json = self.highlights[highlight_id]
+            if from_date or to_date:
+                highlighted_at = highlight_json.get("highlighted_at")
+                if not highlighted_at:
+                    continue
+                highlighted_on = parse_timestamp(highlighted_at).date()
+                if from_date and highlighted_on < from_date:
+                    continue
+                if to_date and highlighted_on > to_date:
+                    continue
+            highlights.append(Highlight(**highlight_json))
+
+        return highlights
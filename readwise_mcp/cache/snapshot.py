@@ -0,0 +1,211 @@
+# Standard Library
+import asyncio
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Any, Dict, Optional
+
+# Internal Libraries
+from readwise_mcp.cache.library import SECTION_NAMES, LibraryCache
+from readwise_mcp.utils import json_codec
+
+SNAPSHOT_MAGIC = b"RWMCPSNP"
+
+# Bump whenever the layout of the snapshot or of its sections changes
+SNAPSHOT_VERSION = 3
+
+_HEADER_LENGTH = struct.Struct(">I")
+
+# Sections holding records are stored as lists and re-keyed by id on load, since JSON
+# object keys are always strings.
+_RECORD_SECTIONS = ("books", "highlights")
+
+
+def _encode_section(name: str, value: Any) -> bytes:
+    if name in _RECORD_SECTIONS:
+        value = list(value.values())
+    return zlib.compress(json_codec.dumps(value))
+
+
+def _decode_section(name: str, blob: bytes) -> Any:
+    value = json_codec.loads(zlib.decompress(blob))
+    if name in _RECORD_SECTIONS:
+        return {record["id"]: record for record in value}
+    return value
+
+
+class _SnapshotSection:
+    """Loader of a section of a memory-mapped snapshot.
+
+    It also hands back the encoded section, so that a section never accessed since the snapshot
+    was loaded is written to the next snapshot as is, without being decoded.
+    """
+
+    def __init__(self, name: str, data: mmap.mmap, start: int, length: int):
+        self.name = name
+        self._data = data
+        self._start = start
+        self._length = length
+
+    def __call__(self) -> Any:
+        return _decode_section(self.name, self.blob())
+
+    def blob(self) -> bytes:
+        return self._data[self._start : self._start + self._length]
+
+
+def save_snapshot(library: LibraryCache, path: str) -> None:
+    """Write a library to disk atomically.
+
+    The file starts with a magic string and a JSON header holding the format version, the
+    sync watermarks, the time of the last full sync of each endpoint and the offset, length and CRC-32 of each section. Sections follow as
+    independent zlib-compressed JSON blobs, so a reader only has to decode the ones it actually uses.
+
+    Args:
+        library (LibraryCache): The library to snapshot.
+        path (str): Destination file path.
+    """
+    _write_snapshot(library.copy_sections(), library.watermarks, library.full_synced_at, path)
+
+
+async def save_snapshot_in_background(library: LibraryCache, path: str) -> None:
+    """Write a library to disk like `save_snapshot`, encoding it in a worker thread.
+
+    Only copying the loaded sections happens on the event loop, so that the library can keep
+    being queried and synced while the snapshot is written.
+    """
+    sections = library.copy_sections()
+    watermarks = dict(library.watermarks)
+    full_synced_at = dict(library.full_synced_at)
+    await asyncio.to_thread(_write_snapshot, sections, watermarks, full_synced_at, path)
+
+
+def _write_snapshot(
+    sections: Dict[str, Any],
+    watermarks: Dict[str, Optional[str]],
+    full_synced_at: Dict[str, Optional[float]],
+    path: str,
+) -> None:
+    blobs: Dict[str, bytes] = {}
+    for name in SECTION_NAMES:
+        section = sections[name]
+        if isinstance(section, _SnapshotSection):
+            blobs[name] = section.blob()
+        else:
+            blobs[name] = _encode_section(name, section() if callable(section) else section)
+
+    offset = 0
+    layout = {}
+    for name, blob in blobs.items():
+        layout[name] = [offset, len(blob), zlib.crc32(blob)]
+        offset += len(blob)
+
+    header = json.dumps(
+        {
+            "version": SNAPSHOT_VERSION,
+            "watermarks": watermarks,
+            "full_synced_at": full_synced_at,
+            "sections": layout,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for blob in blobs.values():
+                f.write(blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    logging.info(f"Saved library snapshot to {path} ({offset + len(header)} bytes)")
+
+
+def _discard_snapshot(path: str, reason: Any) -> None:
+    """Delete a snapshot that cannot be used, so that it is not loaded again after a restart."""
+    logging.warning(f"Deleting corrupt library snapshot {path}: {reason}")
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def load_snapshot(path: str) -> Optional[LibraryCache]:
+    """Load a library snapshot lazily.
+
+    The file is memory-mapped and only its header is parsed and the section checksums verified
+    here; every section is decoded on first access. Missing and outdated snapshots are ignored,
+    corrupt ones are deleted.
+
+    Args:
+        path (str): Snapshot file path.
+
+    Returns:
+        Optional[LibraryCache]: The library backed by the snapshot, or None if it cannot be used.
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            logging.warning(f"Ignoring empty library snapshot {path}")
+            return None
+
+    try:
+        if data[: len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError("bad magic")
+        header_start = len(SNAPSHOT_MAGIC) + _HEADER_LENGTH.size
+        (header_length,) = _HEADER_LENGTH.unpack(data[len(SNAPSHOT_MAGIC) : header_start])
+        header = json.loads(data[header_start : header_start + header_length])
+    except (ValueError, struct.error) as e:
+        data.close()
+        _discard_snapshot(path, e)
+        return None
+
+    if header.get("version") != SNAPSHOT_VERSION:
+        data.close()
+        logging.warning(f"Ignoring library snapshot {path} with version {header.get('version')}")
+        return None
+
+    data_start = header_start + header_length
+
+    # Check every section up front: CRC-32 runs much faster than decoding, and a snapshot that
+    # turns out to be corrupt halfway through a query would leave the library inconsistent.
+    try:
+        for name in SECTION_NAMES:
+            offset, length, checksum = header["sections"][name]
+            start = data_start + offset
+            if start + length > len(data):
+                raise ValueError(f"section {name} is truncated")
+            if zlib.crc32(data[start : start + length]) != checksum:
+                raise ValueError(f"section {name} does not match its checksum")
+    except (KeyError, TypeError, ValueError) as e:
+        data.close()
+        _discard_snapshot(path, e)
+        return None
+
+    sections = {}
+    for name in SECTION_NAMES:
+        offset, length, _ = header["sections"][name]
+        sections[name] = _SnapshotSection(name, data, data_start + offset, length)
+    # Sections can still fail to decode later on, in which case the library discards itself
+    return LibraryCache(
+        sections=sections,
+        watermarks=header["watermarks"],
+        full_synced_at=header["full_synced_at"],
+        on_corrupt=lambda: _discard_snapshot(path, "a section cannot be decoded"),
+    )
@@ -0,0 +1,151 @@
+# Standard Library
+import heapq
+import itertools
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+# Number of candidates scored per requested result, and at least
+CANDIDATES_PER_RESULT = 20
+MIN_CANDIDATES = 100
+
+
+def normalize(text: str) -> str:
+    """Lowercase a text, strip its accents and replace punctuation with single spaces.
+
+    For instance "Thinking, Fast and Slow" becomes "thinking fast and slow".
+    """
+    if not text.isascii():
+        decomposed = unicodedata.normalize("NFKD", text)
+        text = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Return the trigrams of the normalized words of a text.
+
+    Like PostgreSQL's pg_trgm, each word is padded with two spaces in front and one behind,
+    so that short words and word starts weigh in the similarity.
+    """
+    padded = "".join(f"  {word} " for word in normalize(text).split())
+    # Windows overlapping two words end with two spaces and are not trigrams
+    return frozenset(gram for gram in {padded[i : i + 3] for i in range(len(padded) - 2)} if not gram.endswith("  "))
+
+
+class TrigramIndex:
+    """Similarity index over short texts such as titles, updated incrementally.
+
+    A document can be indexed under several texts (e.g. its title alone, and its title
+    followed by its author); its score is the best one among them. The score of a text is
+    the average of:
+    - its Jaccard similarity with the query, which favours close matches, and
+    - the share of the query's trigrams it contains, so that a query leaving out a
+      subtitle or an author still ranks the right document first.
+
+    That score ranks candidates well but is too lenient to pick a document on its own: a
+    single word such as "The" fully covers many titles. `match` therefore only compares the
+    query with the names of the documents, by Jaccard similarity alone.
+
+    Only the documents sharing the most selective trigrams with the query are scored, which
+    keeps lookups fast on large libraries. Trigrams shared by more than COMMON_TRIGRAM_RATIO of
+    the documents (typically word starts such as "  t") are not used to find candidates, unless
+    the query has no other trigram, but still count in the scores.
+    """
+
+    COMMON_TRIGRAM_RATIO = 0.05
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._entries: Dict[Hashable, List[FrozenSet[str]]] = {}
+        # Number of texts at the start of each document's entries that are names of the document
+        self._num_names: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, doc_id: Hashable, *texts: str, num_names: int = 1) -> None:
+        """Index a document under one or more texts, replacing any previous entry.
+
+        The first `num_names` texts are names of the document, which `match` compares queries with.
+        """
+        self.remove(doc_id)
+        entries = [trigrams(text) for text in texts]
+        self._entries[doc_id] = entries
+        self._num_names[doc_id] = num_names
+        for gram in frozenset().union(*entries):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: Hashable) -> None:
+        """Remove a document from the index, if present."""
+        self._num_names.pop(doc_id, None)
+        for gram in frozenset().union(*self._entries.pop(doc_id, [])):
+            postings = self._postings[gram]
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[gram]
+
+    def _candidates(self, query_grams: FrozenSet[str], limit: int) -> List[Hashable]:
+        """Return the documents sharing the most selective trigrams with the query."""
+        # Trigrams that no document has (e.g. from a typo) cannot find candidates
+        postings = sorted((self._postings[gram] for gram in query_grams if gram in self._postings), key=len)
+        if not postings:
+            return []
+        max_postings = max(len(postings[0]), self.COMMON_TRIGRAM_RATIO * len(self._entries))
+        selective = [doc_ids for doc_ids in postings if len(doc_ids) <= max_postings]
+
+        shared = Counter(itertools.chain.from_iterable(selective))
+        return [doc_id for doc_id, _ in shared.most_common(limit)]
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[Tuple[Hashable, float]]:
+        """Return the best matching documents with their scores, best first.
+
+        Args:
+            query (str): The text to look up.
+            limit (int): Maximum number of results.
+            min_score (float): Minimum score, between 0 and 1, of the returned documents.
+
+        Returns:
+            List[Tuple[Hashable, float]]: (document id, score) pairs.
+        """
+        query_grams = trigrams(query)
+        if not query_grams or not self._entries:
+            return []
+
+        scores: List[Tuple[Hashable, float]] = []
+        for doc_id in self._candidates(query_grams, max(limit * CANDIDATES_PER_RESULT, MIN_CANDIDATES)):
+            best = 0.0
+            for grams in self._entries[doc_id]:
+                shared = len(query_grams & grams)
+                jaccard = shared / (len(query_grams) + len(grams) - shared)
+                coverage = shared / len(query_grams)
+                best = max(best, (jaccard + coverage) / 2)
+            if best > 0 and best >= min_score:
+                scores.append((doc_id, best))
+
+        return heapq.nlargest(limit, scores, key=lambda item: item[1])
+
+    def match(self, query: str, min_similarity: float) -> Optional[Tuple[Hashable, float]]:
+        """Return the document with the name most similar to a query, if similar enough.
+
+        Args:
+            query (str): The name to look up.
+            min_similarity (float): Minimum Jaccard similarity, between 0 and 1, with the query.
+
+        Returns:
+            Optional[Tuple[Hashable, float]]: The (document id, similarity) pair, or None.
+        """
+        query_grams = trigrams(query)
+        if not query_grams or not self._entries:
+            return None
+
+        best: Optional[Tuple[Hashable, float]] = None
+        for doc_id in self._candidates(query_grams, MIN_CANDIDATES):
+            for grams in self._entries[doc_id][: self._num_names[doc_id]]:
+                shared = len(query_grams & grams)
+                similarity = shared / (len(query_grams) + len(grams) - shared)
+                if similarity >= min_similarity and (best is None or similarity > best[1]):
+                    best = (doc_id, similarity)
+        return best
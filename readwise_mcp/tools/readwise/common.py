@@ -1,20 +1,44 @@
 # Standard Library
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 # Third Party
 import httpx
 
 # Internal Libraries
+from readwise_mcp.cache.backends import CacheBackend, InMemoryCacheBackend
+from readwise_mcp.tools.readwise.pagination import PageSizer
+from readwise_mcp.tools.readwise.tenants import TENANTS, Tenant
 from readwise_mcp.types.book import BookCategory
+from readwise_mcp.utils import json_codec
+from readwise_mcp.utils.json_stream import JSONStreamParser
 
-READWISE_API_URL = "https://readwise.io/api/v2"
-
-PAGE_SIZE = 50
+# Can be pointed at a proxy or at a mock API, e.g. in benchmarks
+READWISE_API_URL = os.getenv("READWISE_API_URL", "https://readwise.io/api/v2")
 
 DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS = 1
 
+RESPONSE_CACHE_TTL_IN_SECONDS = 60
+
+RESPONSE_CACHE: CacheBackend = InMemoryCacheBackend()
+
+# The incremental parser can only decode with the stdlib scanner. When a faster backend is installed,
+# buffering a page and decoding it at once (see `json_codec.loads_page`) takes half the CPU or less,
+# and the PageSizer keeps pages close to TARGET_PAGE_BYTES anyway.
+STREAM_PAGES = json_codec.BACKEND == "json"
+
+
+class ReadwiseClientError(Exception):
+    """The API rejected a request as invalid (a 4xx other than 429), so retrying it would fail again."""
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 def to_book_category(category_str: str) -> BookCategory:
     """Convert a string to a BookCategory enum.
@@ -34,30 +58,279 @@ def to_book_category(category_str: str) -> BookCategory:
         raise ValueError(f"Invalid category: {category_str}. Valid categories are: {BookCategory.get_valid_values()}")
 
 
+async def drop_cached_responses(tenant: Tenant) -> None:
+    """Drop every response cached on behalf of a tenant."""
+    await RESPONSE_CACHE.delete_prefix(f"{tenant.namespace}:")
+
+
+# The responses of evicted tenants would otherwise linger until the cache evicts them
+TENANTS.on_evict = drop_cached_responses
+
+
+def set_response_cache(backend: CacheBackend) -> None:
+    """Replace the backend caching API responses, e.g. with one shared by several replicas."""
+    global RESPONSE_CACHE
+    RESPONSE_CACHE = backend
+
+
+def response_cache_key(namespace: str, url: str, params: Optional[Dict] = None) -> str:
+    """Build the cache key of a request. Keys are prefixed by the tenant namespace."""
+    return f"{namespace}:{httpx.URL(url).copy_merge_params(sorted((params or {}).items()))}"
+
+
 async def get_data(api_key: str, url: str, params: Optional[Dict] = None, retries: int = 3) -> List | Dict:
-    """Get data from the API."""
+    """Get data from the API.
+
+    Requests go through the pooled HTTP client and the rate limiter of the tenant owning the API key.
+    Responses are cached in RESPONSE_CACHE for RESPONSE_CACHE_TTL_IN_SECONDS; on a miss, only one
+    caller (across all the processes sharing the cache) fetches the data while the others wait for it.
+    """
+
+    tenant = await TENANTS.get(api_key)
+    cache_key = response_cache_key(tenant.namespace, url, params)
+
+    cached = await RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        return json_codec.loads(cached)
+
+    async with RESPONSE_CACHE.lock(cache_key):
+        # Another caller may have refreshed the key while we were waiting for the lock
+        cached = await RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return json_codec.loads(cached)
+
+        data = await fetch_data(tenant, url, params, retries)
+        await RESPONSE_CACHE.set(cache_key, json_codec.dumps(data), RESPONSE_CACHE_TTL_IN_SECONDS)
+        return data
+
+
+async def fetch_data(tenant: Tenant, url: str, params: Optional[Dict] = None, retries: int = 3) -> List | Dict:
+    """Fetch data from the API on behalf of a tenant, bypassing the response cache."""
+    return await request_data(tenant, "GET", url, params=params, retries=retries)
+
+
+async def get_count(api_key: str, url: str, params: Optional[Dict] = None) -> int:
+    """Return the total number of records of a list endpoint, bypassing the response cache."""
+    tenant = await TENANTS.get(api_key)
+    page = await fetch_data(tenant, url, {**(params or {}), "page_size": 1})
+    return page["count"]
+
+
+@asynccontextmanager
+async def write_session(api_key: str) -> AsyncIterator[Tenant]:
+    """Context for write requests (POST, DELETE...) sent with `request_data` on behalf of an API key.
+
+    It yields the tenant owning the key, so that the requests go through its pooled HTTP client and
+    rate limiter. When the context exits, every cached response of the tenant is dropped from
+    RESPONSE_CACHE once, since any of them may now be stale.
+    """
+
+    tenant = await TENANTS.get(api_key)
+    try:
+        yield tenant
+    finally:
+        # Also invalidate after a failure: writes may have been applied before the error
+        await drop_cached_responses(tenant)
+
+
+async def request_data(
+    tenant: Tenant,
+    method: str,
+    url: str,
+    params: Optional[Dict] = None,
+    payload: Optional[List | Dict] = None,
+    retries: int = 3,
+) -> Optional[List | Dict]:
+    """Send a request on behalf of a tenant, retrying on rate limits and errors.
+
+    Returns the decoded JSON body of the response, or None if it has no body (e.g. a 204).
 
+    Raises:
+        ReadwiseClientError: If the API rejects the request as invalid. It is not retried.
+    """
+
+    content = json_codec.dumps(payload) if payload is not None else None
+    headers = {"Content-Type": "application/json"} if content is not None else None
+
+    last_error: Optional[Exception] = None
     for _ in range(retries):
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers={"Authorization": f"Token {api_key}"}, params=params)
-                # Check whether we got a 429 HTTP error
+        await tenant.rate_limiter.acquire()
+        try:
+            response = await tenant.client.request(method, url, params=params, content=content, headers=headers)
+            # Check whether we got a 429 HTTP error
+            if response.status_code == 429:
+                # Extract the Retry-After header
+                retry_after = response.headers.get("Retry-After")
+                if retry_after:
+                    logging.info(f"Rate limit exceeded. Retrying in {retry_after} seconds.")
+                    await asyncio.sleep(int(retry_after))
+                    continue
+                else:
+                    logging.info("Rate limit exceeded. Retrying in 1 second.")
+                    await asyncio.sleep(1)
+                    continue
+            if response.is_client_error:
+                raise ReadwiseClientError(
+                    f"Failed to {method} data from {url} with params {params}: {response.status_code} {response.text}",
+                    response.status_code,
+                )
+            if not response.is_success:
+                raise Exception(f"Failed to {method} data from {url}: {response.status_code} {response.text}")
+            return json_codec.loads(response.content) if response.content else None
+        except ReadwiseClientError:
+            raise
+        except Exception as e:
+            logging.error(f"Error sending {method} request to {url}: {e}")
+            last_error = e
+            continue
+
+    raise Exception(f"Failed to {method} data from {url} with params {params}: {last_error}")
+
+
+async def iter_records(api_key: str, url: str, params: Optional[Dict] = None) -> AsyncIterator[Dict]:
+    """Iterate over the records of every page of a list endpoint.
+
+    The page size is picked by the tenant's PageSizer for the endpoint and may change during the
+    walk, whenever the number of records already read is a multiple of the new size. Uncached
+    pages are parsed incrementally while they are downloaded, each record being yielded as soon
+    as it has been decoded, unless a fast JSON backend is installed (see STREAM_PAGES).
+
+    Callers that may stop early should wrap the iterator in `contextlib.aclosing` so that the
+    current response is released immediately.
+    """
+
+    tenant = await TENANTS.get(api_key)
+    sizer = tenant.page_sizer(httpx.URL(url).path)
+    params = dict(params or {})
+
+    page_size = sizer.page_size
+    offset = 0
+    while True:
+        page_params = {**params, "page_size": page_size}
+        if offset:
+            page_params["page"] = offset // page_size + 1
+
+        envelope: Dict[str, Any] = {}
+        async with aclosing(get_page_records(tenant, sizer, url, page_params, envelope)) as records:
+            async for record in records:
+                yield record
+
+        if not envelope.get("next"):
+            break
+
+        offset += page_size
+        if sizer.page_size != page_size and offset % sizer.page_size == 0:
+            page_size = sizer.page_size
+
+        await asyncio.sleep(DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS)
+
+
+async def get_page_records(
+    tenant: Tenant, sizer: PageSizer, url: str, params: Dict, envelope: Dict[str, Any]
+) -> AsyncIterator[Dict]:
+    """Yield the records of a single page, from the response cache or from the API.
+
+    The other top-level fields of the page (`count`, `next`...) are stored in `envelope`. Pages
+    fetched from the API are cached as the raw body received, which takes a fraction of the
+    memory of the decoded records and needs no re-encoding.
+    """
+
+    cache_key = response_cache_key(tenant.namespace, url, params)
+
+    cached = await RESPONSE_CACHE.get(cache_key)
+    if cached is None:
+        async with RESPONSE_CACHE.lock(cache_key):
+            # Another caller may have refreshed the key while we were waiting for the lock
+            cached = await RESPONSE_CACHE.get(cache_key)
+            if cached is None:
+                body: List[bytes] = []
+                async with aclosing(stream_page(tenant, sizer, url, params, envelope, body=body)) as stream:
+                    async for record in stream:
+                        yield record
+
+                await RESPONSE_CACHE.set(cache_key, b"".join(body), RESPONSE_CACHE_TTL_IN_SECONDS)
+                return
+
+    page = json_codec.loads_page(cached)
+    for record in page.pop("results"):
+        yield record
+    envelope.update(page)
+
+
+async def stream_page(
+    tenant: Tenant,
+    sizer: PageSizer,
+    url: str,
+    params: Dict,
+    envelope: Dict[str, Any],
+    retries: int = 3,
+    body: Optional[List[bytes]] = None,
+) -> AsyncIterator[Dict]:
+    """Download a page and yield its records, while the response body is being received if
+    STREAM_PAGES is set, or once it has been received and decoded with json_codec otherwise.
+
+    The page's latency and size are reported to the sizer. Failures are retried like in
+    `fetch_data`, as long as no record of the page has been yielded yet. When `body` is given,
+    the decoded chunks of the response body are appended to it.
+    """
+
+    for _ in range(retries):
+        await tenant.rate_limiter.acquire()
+        if body is not None:
+            # Drop the chunks of a failed attempt
+            body.clear()
+        started_at = time.monotonic()
+        yielded = False
+        try:
+            async with tenant.client.stream("GET", url, params=params) as response:
                 if response.status_code == 429:
-                    # Extract the Retry-After header
-                    retry_after = response.headers.get("Retry-After")
-                    if retry_after:
-                        logging.info(f"Rate limit exceeded. Retrying in {retry_after} seconds.")
-                        await asyncio.sleep(int(retry_after))
-                        continue
-                    else:
-                        logging.info("Rate limit exceeded. Retrying in 1 second.")
-                        await asyncio.sleep(1)
-                        continue
+                    retry_after = int(response.headers.get("Retry-After", 1))
+                    logging.info(f"Rate limit exceeded. Retrying in {retry_after} seconds.")
+                    await asyncio.sleep(retry_after)
+                    continue
                 if response.status_code != 200:
+                    await response.aread()
                     raise Exception(f"Failed to get data from {url}: {response.status_code} {response.text}")
-                return response.json()
-            except Exception as e:
-                logging.error(f"Error getting data from {url}: {e}")
-                continue
+
+                chunks: List[bytes] = body if body is not None else []
+                num_bytes = 0
+                if STREAM_PAGES:
+                    parser = JSONStreamParser("results")
+                    async for chunk in response.aiter_bytes():
+                        num_bytes += len(chunk)
+                        if body is not None:
+                            body.append(chunk)
+                        for record in parser.feed(chunk):
+                            yielded = True
+                            yield record
+                    envelope.update(parser.close())
+                    num_records = parser.count
+                else:
+                    async for chunk in response.aiter_bytes():
+                        num_bytes += len(chunk)
+                        chunks.append(chunk)
+
+            if not STREAM_PAGES:
+                page_body = b"".join(chunks)
+                chunks.clear()
+                if body is not None:
+                    body.append(page_body)
+                page = json_codec.loads_page(page_body)
+                del page_body
+                records = page.pop("results")
+                envelope.update(page)
+                num_records = len(records)
+
+            sizer.observe(num_records, num_bytes, time.monotonic() - started_at)
+            if not STREAM_PAGES:
+                for record in records:
+                    yielded = True
+                    yield record
+            return
+        except Exception as e:
+            if yielded:
+                raise
+            logging.error(f"Error getting data from {url}: {e}")
+            continue
 
     raise Exception(f"Failed to get data from {url} with params {params} after {retries} retries")
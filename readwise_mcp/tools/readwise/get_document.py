@@ -1,18 +1,13 @@
 # Standard Library
 import asyncio
 import logging
+from contextlib import aclosing
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 # Internal Libraries
-from readwise_mcp.tools.readwise.common import (
-    DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS,
-    PAGE_SIZE,
-    READWISE_API_URL,
-    get_data,
-    to_book_category,
-)
-from readwise_mcp.types.book import Book
+from readwise_mcp.tools.readwise.common import READWISE_API_URL, iter_records, to_book_category
+from readwise_mcp.types.book import Book, BookCategory
 
 
 async def get_documents_by_names(
@@ -26,7 +21,7 @@ async def get_documents_by_names(
     results: Dict[str, Optional[Book]] = {name: None for name in document_names}
     found_names_lower = set()
 
-    params = {"page_size": PAGE_SIZE}
+    params = {}
     if document_category:
         try:
             params["category"] = to_book_category(document_category).value
@@ -34,21 +29,11 @@ async def get_documents_by_names(
             raise ValueError(f"Invalid category: {document_category}. {str(e)}")
 
     url = f"{READWISE_API_URL}/books/"
-    first_request = True
 
     logging.debug(f"Searching for documents in {url} with params: {params}")
 
-    while True:
-        # Pass params only on the first request. Subsequent requests use the 'next' URL.
-        current_params = params if first_request else None
-        response = await get_data(readwise_api_key, url, current_params)
-        first_request = False
-
-        logging.info(f"Response: {response}")
-
-        books_json = response["results"]
-
-        for book_json in books_json:
+    async with aclosing(iter_records(readwise_api_key, url, params)) as books_json:
+        async for book_json in books_json:
             book_title_lower = book_json["title"].lower()
             # Check if this book title matches one of the requested names (case-insensitive)
             # and we haven't found it yet.
@@ -58,20 +43,10 @@ async def get_documents_by_names(
                 results[original_name] = Book(**book_json)
                 found_names_lower.add(book_title_lower)
 
-        # Check if all requested documents have been found
-        if len(found_names_lower) == len(document_names):
-            logging.info("Found all requested documents.")
-            break
-
-        url = response.get("next", None)
-        if not url:
-            logging.info("No more pages to fetch from Readwise API.")
-            break
-
-        logging.info(
-            f"Fetched page, found {len(found_names_lower)}/{len(document_names)} requested documents so far. Next url: {url is not None}"
-        )
-        await asyncio.sleep(DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS)  # Small delay between requests
+                # Check if all requested documents have been found
+                if len(found_names_lower) == len(document_names):
+                    logging.info("Found all requested documents.")
+                    break
 
     # Log any names that were not found
     not_found_names = [name for name, book in results.items() if book is None]
@@ -83,24 +58,42 @@ async def get_documents_by_names(
 
 async def list_documents_by_filters(
     readwise_api_key: str,
-    document_category: str = "",
+    document_categories: Optional[Iterable[BookCategory | str]] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
 ) -> List[Book]:
-    """List all documents in Readwise based on either category or date range
-    Make sure to provide at least one of the parameters.
+    """List all documents in Readwise based on categories and/or a date range.
+    Make sure to provide at least one of the filters.
+
+    Each category is listed by its own paginated walk of the books endpoint. The walks run
+    concurrently and share the rate limiter of the account, so asking for several categories
+    takes about as long as the largest one.
+
+    Args:
+        readwise_api_key (str): The Readwise API key.
+        document_categories (Optional[Iterable[BookCategory | str]]): The categories to list.
+            All categories are listed when empty.
+        from_date (Optional[date]): Only list documents last highlighted after this date.
+        to_date (Optional[date]): Only list documents last highlighted before this date.
+
+    Returns:
+        List[Book]: The documents, de-duplicated and sorted by last highlight, most recent first.
+
+    Raises:
+        ValueError: If no filter is provided or a category is invalid.
     """
 
-    params = {}
-    if document_category:
-        # Validate that the category is a valid BookCategory
+    categories = set()
+    for category in document_categories or []:
+        if isinstance(category, BookCategory):
+            categories.add(category)
+            continue
         try:
-            params["category"] = to_book_category(document_category).value
+            categories.add(to_book_category(category))
         except ValueError as e:
-            raise ValueError(f"Invalid category: {document_category}. {str(e)}")
-
-    url = f"{READWISE_API_URL}/books/"
+            raise ValueError(f"Invalid category: {category}. {str(e)}")
 
+    params = {}
     if from_date:
         from_date_str = from_date.isoformat() + "T00:00:00Z"
         params["last_highlight_at__gt"] = from_date_str
@@ -109,28 +102,23 @@ async def list_documents_by_filters(
         to_date_str = to_date.isoformat() + "T23:59:59Z"
         params["last_highlight_at__lt"] = to_date_str
 
-    if not params:
+    if not params and not categories:
         raise ValueError("At least one parameter must be provided")
 
-    params["page_size"] = PAGE_SIZE
-
-    books: List[Book] = []
-    first_request = True
-
-    while True:
-        # Pass params only on the first request. Subsequent requests use the 'next' URL which contains all params.
-        current_params = params if first_request else None
-        response = await get_data(readwise_api_key, url, current_params)
-        first_request = False
+    url = f"{READWISE_API_URL}/books/"
 
-        books_json = response["results"]
-        books.extend([Book(**book_json) for book_json in books_json])
+    async def list_category(category: Optional[BookCategory]) -> List[Dict]:
+        category_params = {**params, "category": category.value} if category else params
+        return [book_json async for book_json in iter_records(readwise_api_key, url, category_params)]
 
-        url = response.get("next", None)
-        if not url:
-            break
+    # Without categories, a single walk lists the documents of every category
+    walks = [list_category(category) for category in sorted(categories, key=lambda c: c.value)] or [list_category(None)]
+    books_by_id: Dict[int, Book] = {}
+    for books_json in await asyncio.gather(*walks):
+        for book_json in books_json:
+            books_by_id.setdefault(book_json["id"], Book(**book_json))
 
-        logging.info(f"Fetched {len(books_json)} books. Next url: {url}")
+    books = sorted(books_by_id.values(), key=lambda book: (book.last_highlight_at, book.id), reverse=True)
+    logging.info(f"Fetched {len(books)} books in {len(walks)} concurrent listings.")
 
-        await asyncio.sleep(DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS)
     return books
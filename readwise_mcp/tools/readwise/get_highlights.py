@@ -1,15 +1,10 @@
 # Standard Library
-import asyncio
 import logging
 from datetime import date
 from typing import List, Optional
 
 # Internal Libraries
-from readwise_mcp.tools.readwise.common import (
-    DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS,
-    READWISE_API_URL,
-    get_data,
-)
+from readwise_mcp.tools.readwise.common import READWISE_API_URL, iter_records
 from readwise_mcp.types.highlight import Highlight
 
 
@@ -17,28 +12,10 @@ async def get_highlight_by_document_id(api_key: str, document_id: int) -> List[H
     """Get highlights by document id."""
 
     url = f"{READWISE_API_URL}/highlights/"
-    params = {"book_id": document_id, "page_size": 100}
+    params = {"book_id": document_id}
 
-    highlights: List[Highlight] = []
-    first_request = True
-    while True:
-        # Pass params only on the first request.
-        current_params = params if first_request else None
-        hs = await get_data(api_key, url, current_params)
-        first_request = False
-
-        hs_results = hs["results"]
-
-        highlights.extend([Highlight(**h) for h in hs_results])
-
-        total_highlights = hs["count"]
-        logging.info(f"Total highlights: {total_highlights}")
-        url = hs.get("next", None)
-
-        if not url:
-            break
-
-        await asyncio.sleep(DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS)
+    highlights = [Highlight(**h) async for h in iter_records(api_key, url, params)]
+    logging.info(f"Total highlights: {len(highlights)}")
 
     return highlights
 
@@ -69,34 +46,19 @@ async def get_highlights_by_filters(
     highlights: List[Highlight] = []
     logging.info(f"Getting highlights with params: {params}")
 
-    first_request = True
-    while True:
-        # Pass params only on the first request.
-        current_params = params if first_request else None
-        hs = await get_data(api_key, url, current_params)
-        first_request = False
+    async for h in iter_records(api_key, url, params):
+        highlight = Highlight(**h)
 
-        hs_results = hs["results"]
+        # Filter highlights by tags if tag_names is provided
+        if tag_names:
+            # Check if any of the highlight's tags match the requested tag_names
+            highlight_tags = [tag.name for tag in highlight.tags] if highlight.tags else []
+            if not any(tag in highlight_tags for tag in tag_names):
+                continue
 
-        rq_highlights = [Highlight(**h) for h in hs_results]
+        highlights.append(highlight)
 
-        # Filter highlights by tags if tag_names is provided
-        if tag_names and len(tag_names) > 0:
-            # Create a filtered list of highlights that have at least one of the specified tags
-            filtered_highlights = []
-            for highlight in rq_highlights:
-                # Check if any of the highlight's tags match the requested tag_names
-                highlight_tags = [tag.name for tag in highlight.tags] if highlight.tags else []
-                if any(tag in highlight_tags for tag in tag_names):
-                    filtered_highlights.append(highlight)
-
-            highlights.extend(filtered_highlights)
-            logging.info(f"Filtered to {len(highlights)} highlights with tags: {', '.join(tag_names)}")
-
-        url = hs.get("next", None)
-        if not url:
-            break
-
-        await asyncio.sleep(DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS)
+    if tag_names:
+        logging.info(f"Filtered to {len(highlights)} highlights with tags: {', '.join(tag_names)}")
 
     return highlights
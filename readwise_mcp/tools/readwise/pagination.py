@@ -0,0 +1,52 @@
+# Standard Library
+import logging
+
+# Page sizes used for the list endpoints, up to the Readwise API maximum of 1000
+PAGE_SIZES = (50, 100, 200, 500, 1000)
+
+INITIAL_PAGE_SIZE = 100
+
+# Pages are sized to stay under both targets, to bound latency and memory per page
+TARGET_PAGE_SECONDS = 3.0
+TARGET_PAGE_BYTES = 2 * 1024 * 1024
+
+# Weight of the latest page in the moving averages
+SMOOTHING = 0.5
+
+
+class PageSizer:
+    """Adapts the page size of a list endpoint to its observed latency and payload size.
+
+    Every fetched page updates moving averages of the time and bytes per record. The next
+    page size is the largest of PAGE_SIZES that is expected to stay within TARGET_PAGE_SECONDS
+    and TARGET_PAGE_BYTES, and it can at most move up by one step per page.
+    """
+
+    def __init__(self, initial_page_size: int = INITIAL_PAGE_SIZE):
+        self.page_size = initial_page_size
+        self.seconds_per_record = None
+        self.bytes_per_record = None
+
+    def observe(self, num_records: int, num_bytes: int, seconds: float) -> None:
+        """Record the size and latency of a fetched page."""
+        if num_records == 0:
+            return
+
+        self.seconds_per_record = self._smooth(self.seconds_per_record, seconds / num_records)
+        self.bytes_per_record = self._smooth(self.bytes_per_record, num_bytes / num_records)
+
+        target = min(
+            TARGET_PAGE_SECONDS / max(self.seconds_per_record, 1e-9),
+            TARGET_PAGE_BYTES / max(self.bytes_per_record, 1e-9),
+        )
+        fitting = [size for size in PAGE_SIZES if size <= target] or [PAGE_SIZES[0]]
+        next_step = [size for size in PAGE_SIZES if size > self.page_size][:1]
+        page_size = min(fitting[-1], next_step[0] if next_step else PAGE_SIZES[-1])
+
+        if page_size != self.page_size:
+            logging.debug(f"Page size {self.page_size} -> {page_size} ({num_bytes} bytes in {seconds:.2f} s)")
+            self.page_size = page_size
+
+    @staticmethod
+    def _smooth(average, value: float) -> float:
+        return value if average is None else SMOOTHING * value + (1 - SMOOTHING) * average
@@ -0,0 +1,167 @@
+# Standard Library
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# Third Party
+import httpx
+
+# Internal Libraries
+from readwise_mcp.tools.readwise.pagination import PageSizer
+
+# Readwise allows 240 requests per minute per access token
+RATE_LIMIT_REQUESTS_PER_MINUTE = 240
+RATE_LIMIT_BURST = 20
+
+# Connection pool limits of each tenant's HTTP client
+MAX_CONNECTIONS_PER_TENANT = 10
+
+# Tenants unused for this long have their client closed and their caches dropped
+TENANT_IDLE_TIMEOUT_IN_SECONDS = 15 * 60
+
+MAX_TENANTS = 1000
+
+REQUEST_TIMEOUT_IN_SECONDS = 30
+
+# Numeric path segments, i.e. the ids of the records an endpoint is nested under
+_ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)")
+
+
+def tenant_namespace(api_key: str) -> str:
+    """Return a stable identifier for an API key that does not reveal the key itself."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of requests sent on behalf of a single tenant."""
+
+    def __init__(self, requests_per_minute: int = RATE_LIMIT_REQUESTS_PER_MINUTE, burst: int = RATE_LIMIT_BURST):
+        self.rate = requests_per_minute / 60
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent. Waiters are served in FIFO order."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._updated_at = time.monotonic()
+
+            self._tokens -= 1
+
+
+class Tenant:
+    """Per API key state: a pooled HTTP client, a rate limiter, a cache namespace and the
+    page sizes adapted to the account's endpoints.
+
+    Nothing held by a tenant is ever shared with another one, so the data of one Readwise
+    account cannot leak into the responses of another.
+    """
+
+    def __init__(self, api_key: str, transport: Optional[httpx.AsyncBaseTransport] = None, **limiter_kwargs):
+        self.namespace = tenant_namespace(api_key)
+        self.client = httpx.AsyncClient(
+            headers={"Authorization": f"Token {api_key}"},
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS_PER_TENANT),
+            timeout=REQUEST_TIMEOUT_IN_SECONDS,
+            transport=transport,
+        )
+        self.rate_limiter = RateLimiter(**limiter_kwargs)
+        self.cache: Dict[str, Any] = {}
+        self.page_sizers: Dict[str, PageSizer] = {}
+        self.last_used_at = time.monotonic()
+
+    def page_sizer(self, endpoint: str) -> PageSizer:
+        """Return the page sizer of an endpoint, identified by its URL path.
+
+        Ids in the path are replaced with a placeholder, so that e.g. the tags of every highlight
+        share a single sizer rather than adding one per highlight.
+        """
+        return self.page_sizers.setdefault(_ID_SEGMENT.sub("{id}", endpoint), PageSizer())
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        self.cache.clear()
+
+
+class TenantRegistry:
+    """Creates tenants on first use and evicts the ones that have been idle for too long.
+
+    `on_evict` is awaited with each evicted tenant, e.g. to drop what is cached on its behalf
+    outside of the tenant itself.
+    """
+
+    def __init__(
+        self,
+        idle_timeout: float = TENANT_IDLE_TIMEOUT_IN_SECONDS,
+        max_tenants: int = MAX_TENANTS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        on_evict: Optional[Callable[[Tenant], Awaitable[None]]] = None,
+        **limiter_kwargs,
+    ):
+        self.idle_timeout = idle_timeout
+        self.max_tenants = max_tenants
+        self.on_evict = on_evict
+        self._transport = transport
+        self._limiter_kwargs = limiter_kwargs
+        # Ordered from least to most recently used
+        self._tenants: "OrderedDict[str, Tenant]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tenants)
+
+    async def get(self, api_key: str) -> Tenant:
+        """Return the tenant of an API key, creating it if needed.
+
+        Raises:
+            ValueError: If no API key is provided.
+        """
+        if not api_key:
+            raise ValueError("A Readwise API key is required")
+
+        tenant = self._tenants.get(api_key)
+        if tenant is None:
+            tenant = Tenant(api_key, transport=self._transport, **self._limiter_kwargs)
+            self._tenants[api_key] = tenant
+            logging.info(f"Created tenant {tenant.namespace} ({len(self._tenants)} active)")
+
+        self._tenants.move_to_end(api_key)
+        tenant.last_used_at = time.monotonic()
+
+        await self.evict_idle()
+        return tenant
+
+    async def evict_idle(self) -> None:
+        """Close tenants idle for longer than the idle timeout, and the least recently used
+        ones above the maximum number of tenants."""
+        now = time.monotonic()
+        while self._tenants:
+            api_key, tenant = next(iter(self._tenants.items()))
+            if now - tenant.last_used_at < self.idle_timeout and len(self._tenants) <= self.max_tenants:
+                break
+            del self._tenants[api_key]
+            logging.info(f"Evicting tenant {tenant.namespace}")
+            await tenant.aclose()
+            if self.on_evict is not None:
+                await self.on_evict(tenant)
+
+    async def aclose(self) -> None:
+        """Close all tenants."""
+        while self._tenants:
+            _, tenant = self._tenants.popitem()
+            await tenant.aclose()
+
+
+TENANTS = TenantRegistry()
@@ -0,0 +1,240 @@
+# Standard Library
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Internal Libraries
+from readwise_mcp.cache.library import LibraryCache
+from readwise_mcp.tools.readwise.common import (
+    READWISE_API_URL,
+    ReadwiseClientError,
+    iter_records,
+    request_data,
+    write_session,
+)
+from readwise_mcp.types.highlight import HighlightWriteResult, NewHighlight
+from readwise_mcp.types.tag import Tag, TagOperation, TagOperationResult
+from readwise_mcp.utils import json_codec
+
+# Bounds of a single bulk creation request, in number of highlights and in encoded size
+MAX_HIGHLIGHTS_PER_BATCH = 100
+MAX_BATCH_BYTES = 512 * 1024
+
+# Number of highlights whose tags are updated concurrently
+MAX_CONCURRENT_TAG_UPDATES = 10
+
+
+def batch_indexes(highlights_json: List[Dict], max_highlights: int, max_bytes: int) -> List[List[int]]:
+    """Split highlights into consecutive batches of indexes, bounded by count and by encoded size.
+
+    A highlight larger than `max_bytes` on its own still gets a batch of its own.
+    """
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    batch_bytes = 0
+    for index, highlight_json in enumerate(highlights_json):
+        # Count the separator between highlights too
+        size = len(json_codec.dumps(highlight_json)) + 1
+        if batch and (len(batch) >= max_highlights or batch_bytes + size > max_bytes):
+            batches.append(batch)
+            batch, batch_bytes = [], 0
+        batch.append(index)
+        batch_bytes += size
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def chain_batches(
+    batches: List[List[int]], highlights_json: List[Dict], library: Optional[LibraryCache] = None
+) -> List[List[List[int]]]:
+    """Group batches that add highlights to the same new document into chains.
+
+    The batches of a chain must be sent one after another: sent concurrently, each of them could
+    create its own copy of the document. Documents are identified by title and author, and those
+    already in `library` are not new.
+    """
+    chain_of_batch = list(range(len(batches)))
+
+    def find(batch: int) -> int:
+        while chain_of_batch[batch] != batch:
+            chain_of_batch[batch] = chain_of_batch[chain_of_batch[batch]]
+            batch = chain_of_batch[batch]
+        return batch
+
+    batch_of_document: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+    for batch, indexes in enumerate(batches):
+        for index in indexes:
+            title, author = highlights_json[index].get("title"), highlights_json[index].get("author")
+            if library is not None and title and _is_known_document(library, title, author):
+                continue
+            other = batch_of_document.setdefault((title, author), batch)
+            chain_of_batch[find(batch)] = find(other)
+
+    chains: Dict[int, List[List[int]]] = {}
+    for batch, indexes in enumerate(batches):
+        chains.setdefault(find(batch), []).append(indexes)
+    return list(chains.values())
+
+
+def _is_known_document(library: LibraryCache, title: str, author: Optional[str]) -> bool:
+    return any(
+        not author or library.books[book_id].get("author") == author
+        for book_id in library.title_index.get(title.lower(), [])
+    )
+
+
+def _find_book_id(books_json: List[Dict], highlight_json: Dict) -> Optional[int]:
+    """Return the id of the document a created highlight was added to, when it can be told apart."""
+    title = highlight_json.get("title")
+    if not title:
+        return None
+    author = highlight_json.get("author")
+    for book_json in books_json:
+        if book_json.get("title") == title and (not author or book_json.get("author") == author):
+            return book_json["id"]
+    return None
+
+
+async def create_highlights(
+    api_key: str,
+    highlights: List[NewHighlight],
+    library: Optional[LibraryCache] = None,
+    max_highlights_per_batch: int = MAX_HIGHLIGHTS_PER_BATCH,
+    max_batch_bytes: int = MAX_BATCH_BYTES,
+) -> List[HighlightWriteResult]:
+    """Create highlights with the bulk highlights endpoint.
+
+    Highlights are sent in batches bounded by `max_highlights_per_batch` and `max_batch_bytes`.
+    Batches are sent concurrently through the tenant of the API key, so they share its rate
+    limiter and retries, except for batches adding highlights to the same new document, which are
+    sent one after another (see `chain_batches`). A batch that keeps failing only fails its own
+    highlights, and a batch rejected as invalid is split in halves until the invalid highlights
+    are isolated. The cached responses of the API key are invalidated once, after all the batches
+    are sent.
+
+    Args:
+        api_key (str): The Readwise API key.
+        highlights (List[NewHighlight]): The highlights to create.
+        library (Optional[LibraryCache]): The library cache of the account, if any. It is
+            invalidated so that its next sync fetches the new highlights and documents.
+        max_highlights_per_batch (int): Maximum number of highlights per request.
+        max_batch_bytes (int): Maximum encoded size of the highlights of a request.
+
+    Returns:
+        List[HighlightWriteResult]: One result per highlight, in the same order.
+    """
+
+    url = f"{READWISE_API_URL}/highlights/"
+    highlights_json = [highlight.model_dump(mode="json", exclude_none=True) for highlight in highlights]
+    results: List[Optional[HighlightWriteResult]] = [None] * len(highlights_json)
+
+    async def send_batch(indexes: List[int]) -> None:
+        try:
+            books_json = await request_data(
+                tenant, "POST", url, payload={"highlights": [highlights_json[i] for i in indexes]}
+            )
+        except ReadwiseClientError as e:
+            if len(indexes) > 1:
+                # Some highlights are invalid: find out which, so that the others still get created
+                middle = len(indexes) // 2
+                await send_batch(indexes[:middle])
+                await send_batch(indexes[middle:])
+                return
+            logging.error(f"Failed to create highlight {indexes[0]}: {e}")
+            results[indexes[0]] = HighlightWriteResult(index=indexes[0], success=False, error=str(e))
+            return
+        except Exception as e:
+            logging.error(f"Failed to create {len(indexes)} highlights: {e}")
+            for index in indexes:
+                results[index] = HighlightWriteResult(index=index, success=False, error=str(e))
+            return
+
+        for index in indexes:
+            book_id = _find_book_id(books_json or [], highlights_json[index])
+            results[index] = HighlightWriteResult(index=index, success=True, book_id=book_id)
+
+    async def send_chain(chain: List[List[int]]) -> None:
+        for indexes in chain:
+            await send_batch(indexes)
+
+    batches = batch_indexes(highlights_json, max_highlights_per_batch, max_batch_bytes)
+    chains = chain_batches(batches, highlights_json, library)
+    async with write_session(api_key) as tenant:
+        await asyncio.gather(*(send_chain(chain) for chain in chains))
+
+    if library is not None:
+        library.invalidate()
+
+    created = sum(result.success for result in results)
+    logging.info(f"Created {created}/{len(results)} highlights in {len(batches)} batches.")
+    return results
+
+
+async def update_highlight_tags(
+    api_key: str, operations: List[TagOperation], library: Optional[LibraryCache] = None
+) -> List[TagOperationResult]:
+    """Add tags to, and remove tags from, highlights.
+
+    The Readwise API has no bulk endpoint for tags, so operations are grouped by highlight: the
+    operations of a highlight are applied in order, and up to MAX_CONCURRENT_TAG_UPDATES
+    highlights are updated concurrently through the tenant of the API key. Adding a tag the
+    highlight already has is a no-op. The cached responses of the API key are invalidated once,
+    after all the operations are applied.
+
+    Args:
+        api_key (str): The Readwise API key.
+        operations (List[TagOperation]): The tag operations to apply.
+        library (Optional[LibraryCache]): The library cache of the account, if any. The tags of
+            its highlights are updated in place.
+
+    Returns:
+        List[TagOperationResult]: One result per operation, in the same order.
+    """
+
+    results: List[Optional[TagOperationResult]] = [None] * len(operations)
+    indexes_by_highlight: Dict[int, List[int]] = {}
+    for index, operation in enumerate(operations):
+        indexes_by_highlight.setdefault(operation.highlight_id, []).append(index)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_TAG_UPDATES)
+
+    async def update_highlight(highlight_id: int, indexes: List[int]) -> None:
+        url = f"{READWISE_API_URL}/highlights/{highlight_id}/tags/"
+        async with semaphore:
+            try:
+                tags = [tag_json async for tag_json in iter_records(api_key, url)]
+            except Exception as e:
+                logging.error(f"Failed to get the tags of highlight {highlight_id}: {e}")
+                for index in indexes:
+                    results[index] = TagOperationResult(index=index, success=False, error=str(e))
+                return
+
+            for index in indexes:
+                operation = operations[index]
+                tag = next((tag for tag in tags if tag["name"] == operation.tag_name), None)
+                try:
+                    if operation.action == "add":
+                        if tag is None:
+                            tag = await request_data(tenant, "POST", url, payload={"name": operation.tag_name})
+                            tags.append(tag)
+                    else:
+                        if tag is None:
+                            raise ValueError(f"Highlight {highlight_id} has no tag '{operation.tag_name}'")
+                        await request_data(tenant, "DELETE", f"{url}{tag['id']}")
+                        tags.remove(tag)
+                except Exception as e:
+                    logging.error(f"Failed to {operation.action} tag '{operation.tag_name}' on {highlight_id}: {e}")
+                    results[index] = TagOperationResult(index=index, success=False, error=str(e))
+                    continue
+                results[index] = TagOperationResult(index=index, success=True, tag=Tag(**tag))
+
+            if library is not None:
+                library.set_highlight_tags(highlight_id, tags)
+
+    async with write_session(api_key) as tenant:
+        await asyncio.gather(*(update_highlight(h_id, indexes) for h_id, indexes in indexes_by_highlight.items()))
+
+    applied = sum(result.success for result in results)
+    logging.info(f"Applied {applied}/{len(results)} tag operations on {len(indexes_by_highlight)} highlights.")
+    return results
@@ -48,3 +48,10 @@ class Book(BaseModel):
     asin: Optional[str] = None
     tags: List[str | Tag] = []
     document_note: str = ""
+
+
+class BookMatch(BaseModel):
+    """A book returned by a fuzzy search, with its similarity score between 0 and 1."""
+
+    book: Book
+    score: float
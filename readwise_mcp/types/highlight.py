@@ -3,10 +3,11 @@ from datetime import datetime
 from typing import List, Optional
 
 # Third Party
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 
 # Internal Libraries
 # Internal
+from readwise_mcp.types.book import BookCategory
 from readwise_mcp.types.tag import Tag
 
 
@@ -24,3 +25,34 @@ class Highlight(BaseModel):
     updated: datetime
     book_id: int
     tags: List[Tag] = []
+
+
+class NewHighlight(BaseModel):
+    """A highlight to create with the Readwise API.
+
+    Highlights are grouped into documents by title and author. Field lengths follow the limits
+    of the API, so that an oversized highlight is rejected on its own instead of failing the
+    whole batch it is sent with.
+    """
+
+    text: str = Field(min_length=1, max_length=8191)
+    title: Optional[str] = Field(default=None, max_length=511)
+    author: Optional[str] = Field(default=None, max_length=1024)
+    source_url: Optional[str] = Field(default=None, max_length=2047)
+    source_type: Optional[str] = Field(default=None, min_length=3, max_length=64)
+    category: Optional[BookCategory] = None
+    note: Optional[str] = Field(default=None, max_length=8191)
+    location: Optional[int] = None
+    location_type: Optional[str] = None
+    highlighted_at: Optional[datetime] = None
+    highlight_url: Optional[str] = Field(default=None, max_length=4095)
+    image_url: Optional[str] = Field(default=None, max_length=2047)
+
+
+class HighlightWriteResult(BaseModel):
+    """Outcome of the creation of one highlight, in the order the highlights were given."""
+
+    index: int
+    success: bool
+    book_id: Optional[int] = None
+    error: Optional[str] = None
@@ -1,3 +1,6 @@
+# Standard Library
+from typing import Literal, Optional
+
 # Third Party
 from pydantic import BaseModel
 
@@ -7,3 +10,20 @@ class Tag(BaseModel):
 
     id: int
     name: str
+
+
+class TagOperation(BaseModel):
+    """Adds a tag to, or removes a tag from, a highlight."""
+
+    highlight_id: int
+    tag_name: str
+    action: Literal["add", "remove"] = "add"
+
+
+class TagOperationResult(BaseModel):
+    """Outcome of one tag operation, in the order the operations were given."""
+
+    index: int
+    success: bool
+    tag: Optional[Tag] = None
+    error: Optional[str] = None
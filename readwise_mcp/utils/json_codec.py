@@ -0,0 +1,62 @@
+"""JSON encoding and decoding with the fastest available backend.
+
+orjson is used when installed, then msgspec, and the standard library otherwise. Install
+the `fast` extra (`uv sync --extra fast`) to get both.
+"""
+
+# Standard Library
+import json
+from typing import Any
+
+try:
+    # Third Party
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None
+
+try:
+    # Third Party
+    import msgspec
+except ImportError:  # pragma: no cover - depends on the installed extras
+    msgspec = None
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _loads = msgspec.json.decode
+    _dumps = msgspec.json.encode
+else:
+    BACKEND = "json"
+    _loads = _stdlib_loads
+    _dumps = _stdlib_dumps
+
+
+def loads(data: bytes | str) -> Any:
+    """Decode a JSON document."""
+    return _loads(data)
+
+
+def loads_page(data: bytes) -> Any:
+    """Decode a large JSON document, such as a page of records.
+
+    msgspec is preferred here: it decodes as fast as orjson, but orjson allocates a working buffer
+    of several times the size of the document while decoding it.
+    """
+    return msgspec.json.decode(data) if msgspec is not None else _loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode an object as compact UTF-8 JSON."""
+    return _dumps(obj)
@@ -0,0 +1,154 @@
+# Standard Library
+import codecs
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+_WHITESPACE = " \t\n\r"
+# Characters that may follow a complete number, true, false or null
+_SCALAR_DELIMITERS = " \t\n\r,]}"
+_WHITESPACE_RUN = re.compile(r"[ \t\n\r]*")
+_SEPARATOR_RUN = re.compile(r"[ \t\n\r,]*")
+
+# Consumed input is dropped from the buffer once it grows past this many characters
+_COMPACT_THRESHOLD = 64 * 1024
+
+# Parser states
+_START = "start"
+_KEY = "key"
+_ARRAY = "array"
+_DONE = "done"
+
+
+class JSONStreamParser:
+    """Incrementally parse a JSON object holding a large array of records.
+
+    Bytes are fed as they arrive from the network and every element of the `array_key`
+    array is returned as soon as it has been fully received, so the whole document never
+    has to be buffered. Other top-level fields (e.g. `count` and `next`) are collected in
+    `envelope`.
+
+    Example:
+        parser = JSONStreamParser("results")
+        for chunk in chunks:
+            for record in parser.feed(chunk):
+                ...
+        envelope = parser.close()
+    """
+
+    def __init__(self, array_key: str = "results"):
+        self.array_key = array_key
+        self.envelope: Dict[str, Any] = {}
+        self.count = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Feed the next chunk of bytes and return the array elements it completed."""
+        self._buffer += self._text_decoder.decode(chunk)
+        records = self._parse()
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        return records
+
+    def close(self) -> Dict[str, Any]:
+        """Signal the end of the input and return the top-level fields other than the array.
+
+        Raises:
+            ValueError: If the document is incomplete or malformed.
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        self._parse()
+        if self._state != _DONE or self._buffer[self._pos :].strip(_WHITESPACE):
+            raise ValueError(f"Incomplete or invalid JSON document (stopped in state '{self._state}')")
+        return self.envelope
+
+    def _skip(self, pattern: re.Pattern = _WHITESPACE_RUN) -> str:
+        """Skip the characters matched by a pattern and return the next one, or '' if the buffer is exhausted."""
+        self._pos = pattern.match(self._buffer, self._pos).end()
+        return self._buffer[self._pos] if self._pos < len(self._buffer) else ""
+
+    def _decode_value(self) -> Tuple[bool, Any]:
+        """Decode the value at the current position.
+
+        Returns (True, value) once the value is complete. Strings, objects and arrays end with
+        their closing character, but a scalar such as a number is only known to be complete when
+        followed by a delimiter: `350` may be the start of `350.0` split across chunks, so it is
+        left for the next call.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            return False, None
+        if self._buffer[end - 1] not in '"]}' and (
+            end == len(self._buffer) or self._buffer[end] not in _SCALAR_DELIMITERS
+        ):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _parse(self) -> List[Any]:
+        records: List[Any] = []
+        while True:
+            if self._state == _START:
+                char = self._skip()
+                if not char:
+                    return records
+                if char != "{":
+                    raise ValueError(f"Expected a JSON object, got '{char}'")
+                self._pos += 1
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                char = self._skip(_SEPARATOR_RUN)
+                if not char:
+                    return records
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+
+                start = self._pos
+                complete, key = self._decode_value()
+                if not complete:
+                    return records
+                if self._skip() != ":":
+                    # Wait for the separator before consuming the key
+                    self._pos = start
+                    return records
+                self._pos += 1
+
+                char = self._skip()
+                if key == self.array_key and char == "[":
+                    self._pos += 1
+                    self._state = _ARRAY
+                    continue
+
+                complete, value = self._decode_value()
+                if not complete:
+                    # Re-read the key once the value is complete
+                    self._pos = start
+                    return records
+                self.envelope[key] = value
+
+            elif self._state == _ARRAY:
+                char = self._skip(_SEPARATOR_RUN)
+                if not char:
+                    return records
+                if char == "]":
+                    self._pos += 1
+                    self._state = _KEY
+                    continue
+
+                complete, record = self._decode_value()
+                if not complete:
+                    return records
+                records.append(record)
+                self.count += 1
+
+            else:
+                return records
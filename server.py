@@ -1,34 +1,174 @@
 # Standard Library
 import asyncio
+import importlib
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import date
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Set, Tuple
 
 # Third Party
 from dotenv import load_dotenv
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_http_headers, get_http_request
 
 # Internal Libraries
-from readwise_mcp.tools.readwise.get_document import (
-    get_documents_by_names,
-    list_documents_by_filters,
-)
-from readwise_mcp.tools.readwise.get_highlights import (
-    get_highlight_by_document_id,
-    get_highlights_by_filters,
-)
-from readwise_mcp.types.book import Book
-from readwise_mcp.types.highlight import Highlight
+from readwise_mcp.types.book import Book, BookCategory, BookMatch
+from readwise_mcp.types.highlight import Highlight, HighlightWriteResult, NewHighlight
+from readwise_mcp.types.tag import TagOperation, TagOperationResult
 from readwise_mcp.utils.duration import parse_duration
 
+if TYPE_CHECKING:
+    # Internal Libraries
+    from readwise_mcp.cache.library import LibraryCache
+
+# MCP clients spawn the server on demand, so its startup time delays every session. Only the
+# types appearing in the tool signatures are imported up front: the modules implementing the
+# tools (and httpx with them) are imported by each tool, and warmed up in the background as
+# soon as the server starts (see `warm_up`).
+TOOL_MODULES = (
+    "readwise_mcp.cache.library",
+    "readwise_mcp.cache.snapshot",
+    "readwise_mcp.tools.readwise.get_document",
+    "readwise_mcp.tools.readwise.get_highlights",
+    "readwise_mcp.tools.readwise.write_highlights",
+)
+
 load_dotenv()
 
+# API key of stdio sessions, and of HTTP requests without their own key when allowed below
 READWISE_API_KEY = os.getenv("READWISE_API_KEY")
 
+# Whether HTTP requests without their own key may use READWISE_API_KEY, and so the operator's account
+READWISE_ALLOW_DEFAULT_KEY_OVER_HTTP = os.getenv("READWISE_ALLOW_DEFAULT_KEY_OVER_HTTP", "").lower() in ("1", "true")
+
+# Header through which HTTP clients can pass their own Readwise API key
+API_KEY_HEADER = "x-readwise-api-key"
+
+# When set, each account's library (not only its documents) is cached and snapshotted to this directory
+READWISE_SNAPSHOT_DIR = os.getenv("READWISE_SNAPSHOT_DIR")
+
+# When set, API responses are cached in this SQLite database, shared by all the replicas of the host
+READWISE_CACHE_PATH = os.getenv("READWISE_CACHE_PATH")
+
+if READWISE_CACHE_PATH:
+    # Internal Libraries
+    from readwise_mcp.cache.backends import SQLiteCacheBackend
+    from readwise_mcp.tools.readwise.common import set_response_cache
+
+    set_response_cache(SQLiteCacheBackend(READWISE_CACHE_PATH))
+
+
+async def warm_up() -> None:
+    """Import the tool modules and open a connection to Readwise ahead of the first tool call.
+
+    The imports run in a worker thread so that the server keeps answering in the meantime. When
+    READWISE_API_KEY is set, the default tenant is created and its client checks the key with
+    the auth endpoint, which leaves an open connection in its pool. Failures are only logged:
+    the first tool call will then do the same work.
+    """
+    started_at = time.monotonic()
+    try:
+        await asyncio.to_thread(lambda: [importlib.import_module(name) for name in TOOL_MODULES])
+
+        if READWISE_API_KEY:
+            # Internal Libraries
+            from readwise_mcp.tools.readwise.common import READWISE_API_URL, request_data
+            from readwise_mcp.tools.readwise.tenants import TENANTS
+
+            tenant = await TENANTS.get(READWISE_API_KEY)
+            await request_data(tenant, "GET", f"{READWISE_API_URL}/auth/", retries=1)
+    except Exception as e:
+        logging.warning(f"Failed to warm up the server: {e}")
+        return
+
+    logging.info(f"Warmed up the server in {time.monotonic() - started_at:.3f}s")
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warm up the server in the background while it starts serving requests."""
+    task = asyncio.create_task(warm_up())
+    try:
+        yield
+    finally:
+        task.cancel()
+
 
 # Create an MCP server
-mcp = FastMCP("Kiseki-Labs-Readwise-MCP")
+mcp = FastMCP("Kiseki-Labs-Readwise-MCP", lifespan=lifespan)
+
+
+def is_http_request() -> bool:
+    """Return whether the current request came over an HTTP transport rather than stdio."""
+    try:
+        get_http_request()
+    except RuntimeError:
+        return False
+    return True
+
+
+def get_api_key() -> str:
+    """Return the Readwise API key of the current request.
+
+    Over HTTP transports the key is read from the `X-Readwise-Api-Key` header, or from an
+    `Authorization: Token <key>` header as used by the Readwise API itself. Stdio requests use
+    READWISE_API_KEY. HTTP requests without a key only fall back to it when
+    READWISE_ALLOW_DEFAULT_KEY_OVER_HTTP is set, since anyone reaching the server would otherwise
+    read the operator's account.
+
+    Raises:
+        ValueError: If no API key is available.
+    """
+    if not is_http_request():
+        if not READWISE_API_KEY:
+            raise ValueError("No Readwise API key provided: set READWISE_API_KEY")
+        return READWISE_API_KEY
+
+    headers = get_http_headers(include_all=True)
+    api_key = headers.get(API_KEY_HEADER)
+    if not api_key:
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "token":
+            api_key = credentials.strip()
+
+    if not api_key and READWISE_ALLOW_DEFAULT_KEY_OVER_HTTP:
+        api_key = READWISE_API_KEY
+    if not api_key:
+        raise ValueError(f"No Readwise API key provided: send the {API_KEY_HEADER} header")
+    return api_key
+
+
+async def get_library(api_key: str, endpoints: Optional[Tuple[str, ...]] = None) -> "LibraryCache":
+    """Return the library cache of an account after a sync of the given endpoints.
+
+    The library lives in the cache namespace of the account's tenant. When READWISE_SNAPSHOT_DIR
+    is set, the first call loads its snapshot (if any), so a restarted server only has to fetch the
+    records changed since the snapshot was written, and the snapshot is rewritten in a worker thread
+    after each sync that changed the library. All the endpoints are synced by default.
+    """
+    # Internal Libraries
+    from readwise_mcp.cache.library import SYNCED_ENDPOINTS, LibraryCache
+    from readwise_mcp.cache.snapshot import load_snapshot, save_snapshot_in_background
+    from readwise_mcp.tools.readwise.tenants import TENANTS
+
+    tenant = await TENANTS.get(api_key)
+    snapshot_path = (
+        os.path.join(READWISE_SNAPSHOT_DIR, f"{tenant.namespace}.snapshot") if READWISE_SNAPSHOT_DIR else None
+    )
+
+    library = tenant.cache.get("library")
+    if library is None:
+        snapshot = load_snapshot(snapshot_path) if snapshot_path else None
+        library = tenant.cache.setdefault("library", snapshot or LibraryCache())
+
+    if await library.sync(api_key, endpoints or SYNCED_ENDPOINTS) and snapshot_path:
+        # Keep concurrent saves from finishing out of order and replacing a newer snapshot
+        async with tenant.cache.setdefault("snapshot_lock", asyncio.Lock()):
+            await save_snapshot_in_background(library, snapshot_path)
+
+    return library
 
 
 @mcp.tool()
@@ -37,6 +177,11 @@ async def find_readwise_documents_by_names(
 ) -> Dict[str, Optional[Book]]:
     """Find documents in Readwise by a list of names.
 
+    Names are matched against the titles of the documents, ignoring case. A name without an
+    exact match resolves to the closest title if it is similar enough, e.g. "Thinking Fast and
+    Slow" finds "Thinking, Fast and Slow". Partial names such as an author or a single word do
+    not resolve: use `search_readwise_documents` for those.
+
     Args:
         document_names (List[str]): The names of the documents to search for in Readwise.
 
@@ -45,8 +190,25 @@ async def find_readwise_documents_by_names(
         and values are the corresponding Book objects if found, or None otherwise.
     """
 
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.get_document import get_documents_by_names
+    from readwise_mcp.tools.readwise.tenants import TENANTS
+
     logging.info(f"*** Searching for documents: {', '.join(document_names)}")
-    docs_dict = await get_documents_by_names(READWISE_API_KEY, document_names)
+    api_key = get_api_key()
+    tenant = await TENANTS.get(api_key)
+
+    docs_dict: Dict[str, Optional[Book]] = dict.fromkeys(document_names)
+    if not READWISE_SNAPSHOT_DIR and "library" not in tenant.cache:
+        # Exact titles are found without walking every document: the walk stops once all are found
+        docs_dict = await get_documents_by_names(api_key, document_names)
+
+    # Closest titles can only be found among all the documents, which the library holds
+    missing_names = [name for name, doc in docs_dict.items() if doc is None]
+    if missing_names:
+        library = await get_library(api_key, endpoints=("books",))
+        await library.build_fuzzy_index()
+        docs_dict.update(library.find_books_by_titles(missing_names))
 
     found_count = sum(1 for doc in docs_dict.values() if doc is not None)
     logging.info(f"*** Found {found_count}/{len(document_names)} documents.")
@@ -57,20 +219,44 @@ async def find_readwise_documents_by_names(
     return docs_dict
 
 
+@mcp.tool()
+async def search_readwise_documents(
+    query: str,
+    limit: int = 5,
+) -> List[BookMatch]:
+    """Search documents in Readwise whose title or author resemble a query.
+
+    Use this when the exact title of a document is not known, or to disambiguate between
+    several candidates.
+
+    Args:
+        query (str): Part or all of the title and/or author of the documents to search for.
+        limit (int, optional): Maximum number of documents to return. Defaults to 5.
+
+    Returns:
+        List[BookMatch]: The best matching documents with their similarity score between 0 and 1,
+        best first.
+    """
+
+    library = await get_library(get_api_key(), endpoints=("books",))
+    await library.build_fuzzy_index()
+    return library.search_books(query, limit=limit)
+
+
 @mcp.tool()
 async def list_readwise_documents_by_filters(
-    document_category: str = "",
+    document_categories: Optional[Set[BookCategory]] = None,
     duration_expression: Optional[str] = None,
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
 ) -> List[Book]:
-    """List all documents in Readwise based on either category or date range
-    At least one filter must be provided.
+    """List all documents in Readwise based on categories and/or date range
+    At least one filter must be provided. Several categories are listed concurrently in a single call.
 
     Args:
-        document_category (str, optional): The category of the documents to list in Readwise.
-            Allowed values are 'books', 'articles', 'tweets', 'podcasts', 'supplementals',
-            or simply empty string '' if no category is specified. Defaults to "".
+        document_categories (Optional[Set[BookCategory]]): The categories of the documents to list in Readwise.
+            Allowed values are 'books', 'articles', 'tweets', 'podcasts' and 'supplementals'.
+            All categories are listed when not specified. Defaults to None.
         duration_expression (Optional[str]): A duration expression to filter documents by creation date.
             Valid formats: "1w", "2h", "30m", etc.
         from_date (Optional[date]): The start date to filter documents (inclusive).
@@ -79,7 +265,8 @@ async def list_readwise_documents_by_filters(
             Documents created on or before this date will be returned.
 
     Returns:
-        List[Book]: A list of Book objects containing the documents from the specified category.
+        List[Book]: The documents from the specified categories, without duplicates and sorted by
+            last highlight date, most recent first.
 
     Raises:
         ValueError: If no filters are provided (all parameters are None or empty).
@@ -91,7 +278,10 @@ async def list_readwise_documents_by_filters(
     if duration_expression:
         from_date, to_date = parse_duration(duration_expression)
 
-    documents = await list_documents_by_filters(READWISE_API_KEY, document_category, from_date, to_date)
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.get_document import list_documents_by_filters
+
+    documents = await list_documents_by_filters(get_api_key(), document_categories, from_date, to_date)
     return documents
 
 
@@ -115,8 +305,16 @@ async def get_readwise_highlights_by_document_ids(
     if not document_ids:
         raise ValueError("No document IDs provided")
 
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.get_highlights import get_highlight_by_document_id
+
+    api_key = get_api_key()
+    if READWISE_SNAPSHOT_DIR:
+        library = await get_library(api_key)
+        return [highlight for doc_id in document_ids for highlight in library.get_highlights_by_book(doc_id)]
+
     # Create a list of tasks (co-routines), one for each document ID
-    tasks = [get_highlight_by_document_id(READWISE_API_KEY, doc_id) for doc_id in document_ids]
+    tasks = [get_highlight_by_document_id(api_key, doc_id) for doc_id in document_ids]
 
     # Execute all tasks concurrently and gather the results
     results = await asyncio.gather(*tasks)
@@ -166,10 +364,79 @@ async def get_readwise_highlights_by_filters(
     if duration_expression:
         from_date, to_date = parse_duration(duration_expression)
 
-    highlights = await get_highlights_by_filters(READWISE_API_KEY, from_date, to_date, tag_names)
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.get_highlights import get_highlights_by_filters
+
+    api_key = get_api_key()
+    if READWISE_SNAPSHOT_DIR:
+        library = await get_library(api_key)
+        return library.get_highlights_by_filters(from_date, to_date, tag_names)
+
+    highlights = await get_highlights_by_filters(api_key, from_date, to_date, tag_names)
     return highlights
 
 
+@mcp.tool()
+async def create_readwise_highlights(highlights: List[NewHighlight]) -> List[HighlightWriteResult]:
+    """
+    Create highlights in Readwise, in bulk.
+
+    Highlights are grouped into documents by title and author; documents that do not exist yet
+    are created. Large lists are split into several requests sent concurrently.
+
+    Args:
+        highlights (List[NewHighlight]): The highlights to create. Only `text` is required.
+
+    Returns:
+        List[HighlightWriteResult]: One result per highlight, in the same order, telling whether it
+            was created, in which document when known, or why it failed.
+
+    Raises:
+        ValueError: If no highlights are provided.
+    """
+
+    if not highlights:
+        raise ValueError("No highlights provided")
+
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.tenants import TENANTS
+    from readwise_mcp.tools.readwise.write_highlights import create_highlights
+
+    api_key = get_api_key()
+    tenant = await TENANTS.get(api_key)
+    return await create_highlights(api_key, highlights, library=tenant.cache.get("library"))
+
+
+@mcp.tool()
+async def update_readwise_highlight_tags(operations: List[TagOperation]) -> List[TagOperationResult]:
+    """
+    Add tags to, or remove tags from, Readwise highlights, in bulk.
+
+    Args:
+        operations (List[TagOperation]): The operations to apply. Each one names a highlight id, a
+            tag name and an action, either 'add' (the default) or 'remove'. Operations on the same
+            highlight are applied in order.
+
+    Returns:
+        List[TagOperationResult]: One result per operation, in the same order, with the tag added or
+            removed, or why the operation failed.
+
+    Raises:
+        ValueError: If no operations are provided.
+    """
+
+    if not operations:
+        raise ValueError("No tag operations provided")
+
+    # Internal Libraries
+    from readwise_mcp.tools.readwise.tenants import TENANTS
+    from readwise_mcp.tools.readwise.write_highlights import update_highlight_tags
+
+    api_key = get_api_key()
+    tenant = await TENANTS.get(api_key)
+    return await update_highlight_tags(api_key, operations, library=tenant.cache.get("library"))
+
+
 # Add a dynamic greeting resource
 @mcp.resource("greeting://{name}")
 def get_greeting(name: str) -> str:
@@ -1,10 +1,17 @@
 # Standard Library
 import os
+from typing import Optional
 
 # Third Party
+import httpx
 import pytest
 from dotenv import load_dotenv
 
+# Internal Libraries
+from readwise_mcp.cache.backends import CacheBackend, InMemoryCacheBackend
+from readwise_mcp.tools.readwise import common, tenants
+from readwise_mcp.tools.readwise.tenants import TenantRegistry
+
 
 @pytest.fixture(scope="session", autouse=True)
 def load_env():
@@ -19,3 +26,26 @@ def readwise_api_key():
     if not api_key:
         pytest.skip("READWISE_API_KEY environment variable not set, skipping integration test.")
     return api_key
+
+
+@pytest.fixture
+def mock_readwise(monkeypatch):
+    """Fixture to send the Readwise API requests of the tools to a mock transport.
+
+    It returns a function taking the transport, and optionally the response cache (a fresh
+    InMemoryCacheBackend by default) and other TenantRegistry arguments. The function installs a
+    tenant registry using the transport and the response cache, disables the sleep between
+    requests, and returns the registry.
+    """
+
+    def install(
+        transport: httpx.AsyncBaseTransport, response_cache: Optional[CacheBackend] = None, **kwargs
+    ) -> TenantRegistry:
+        registry = TenantRegistry(transport=transport, on_evict=common.drop_cached_responses, **kwargs)
+        monkeypatch.setattr(tenants, "TENANTS", registry)
+        monkeypatch.setattr(common, "TENANTS", registry)
+        monkeypatch.setattr(common, "RESPONSE_CACHE", response_cache or InMemoryCacheBackend())
+        monkeypatch.setattr(common, "DEFAULT_SLEEP_BETWEEN_REQUESTS_IN_SECONDS", 0)
+        return registry
+
+    return install
@@ -0,0 +1 @@
+# Make tests/readwise_mcp/cache directory a package
@@ -0,0 +1,149 @@
+# Standard Library
+import asyncio
+import sqlite3
+import time
+
+# Third Party
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache.backends import InMemoryCacheBackend, SQLiteCacheBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryCacheBackend()
+    else:
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        yield backend
+        backend.close()
+
+
+@pytest.mark.asyncio
+async def test_get_and_set(backend):
+    assert await backend.get("tenant:key") is None
+
+    await backend.set("tenant:key", b"value", ttl=60)
+
+    assert await backend.get("tenant:key") == b"value"
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_returned(backend):
+    await backend.set("tenant:key", b"value", ttl=-1)
+
+    assert await backend.get("tenant:key") is None
+
+
+@pytest.mark.asyncio
+async def test_delete_prefix(backend):
+    await backend.set("tenant-a:books", b"a", ttl=60)
+    await backend.set("tenant-b:books", b"b", ttl=60)
+
+    await backend.delete_prefix("tenant-a:")
+
+    assert await backend.get("tenant-a:books") is None
+    assert await backend.get("tenant-b:books") == b"b"
+
+
+@pytest.mark.asyncio
+async def test_lock_serialises_holders(backend):
+    events = []
+
+    async def hold(name: str) -> None:
+        async with backend.lock("tenant:key"):
+            events.append(f"{name} in")
+            await asyncio.sleep(0.1)
+            events.append(f"{name} out")
+
+    await asyncio.gather(hold("first"), hold("second"))
+
+    assert events == ["first in", "first out", "second in", "second out"]
+
+
+@pytest.mark.asyncio
+async def test_lock_is_entered_after_timeout(backend):
+    async with backend.lock("tenant:key"):
+        start = time.monotonic()
+        async with backend.lock("tenant:key", timeout=0.1):
+            assert time.monotonic() - start >= 0.1
+
+
+def test_in_memory_backend_evicts_oldest_entries():
+    backend = InMemoryCacheBackend(max_entries=2)
+
+    asyncio.run(backend.set("a", b"1", ttl=60))
+    asyncio.run(backend.set("b", b"2", ttl=60))
+    asyncio.run(backend.set("c", b"3", ttl=60))
+
+    assert asyncio.run(backend.get("a")) is None
+    assert asyncio.run(backend.get("c")) == b"3"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_purges_expired_entries_on_set():
+    backend = InMemoryCacheBackend()
+
+    for index in range(500):
+        await backend.set(f"tenant:expired-{index}", b"page", ttl=0)
+    # Entries with a longer TTL do not shield the expired ones behind them from the periodic purge
+    await backend.set("tenant:long", b"page", ttl=60)
+    await backend.set("tenant:short", b"page", ttl=-1)
+    for index in range(100):
+        await backend.set(f"tenant:fresh-{index}", b"page", ttl=60)
+
+    assert len(backend._entries) == 101
+    assert backend._bytes == 101 * len(b"page")
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_is_bounded_in_bytes():
+    backend = InMemoryCacheBackend(max_bytes=10)
+
+    await backend.set("a", b"12345", ttl=60)
+    await backend.set("b", b"12345", ttl=60)
+    await backend.set("c", b"123", ttl=60)
+
+    assert await backend.get("a") is None
+    assert await backend.get("b") == b"12345"
+    assert backend._bytes == 8
+
+    await backend.delete_prefix("b")
+    assert backend._bytes == 3
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backends_share_entries_and_locks(tmp_path):
+    path = str(tmp_path / "cache.db")
+    replica_a = SQLiteCacheBackend(path)
+    replica_b = SQLiteCacheBackend(path)
+
+    await replica_a.set("tenant:key", b"value", ttl=60)
+    assert await replica_b.get("tenant:key") == b"value"
+
+    async with replica_a.lock("tenant:other"):
+        assert not replica_b._try_acquire("tenant:other", "replica-b")
+    assert replica_b._try_acquire("tenant:other", "replica-b")
+
+    replica_a.close()
+    replica_b.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_waits_for_busy_database_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "cache.db")
+    backend = SQLiteCacheBackend(path)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+
+    write = asyncio.create_task(backend.set("tenant:key", b"value", ttl=60))
+    # The write waits on the database lock without blocking the loop, which gets to release it
+    await asyncio.sleep(0.1)
+    assert not write.done()
+    other.execute("COMMIT")
+    await asyncio.wait_for(write, 5)
+
+    assert await backend.get("tenant:key") == b"value"
+    other.close()
+    backend.close()
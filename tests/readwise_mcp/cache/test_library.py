@@ -0,0 +1,214 @@
+# Standard Library
+import asyncio
+import time
+from datetime import date
+
+# Third Party
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache import library as library_module
+from readwise_mcp.cache.library import LibraryCache
+from readwise_mcp.types.book import Book
+from tests.readwise_mcp.factories import make_book_json, make_highlight_json
+
+
+def test_find_books_by_titles_is_case_insensitive():
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Thinking, Fast and Slow"), make_book_json(2, "Deep Work")])
+
+    results = library.find_books_by_titles(["thinking, fast and slow", "Missing Book"])
+
+    assert isinstance(results["thinking, fast and slow"], Book)
+    assert results["thinking, fast and slow"].id == 1
+    assert results["Missing Book"] is None
+
+
+def test_apply_books_reindexes_renamed_book():
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Old Title")])
+    library.apply_books([make_book_json(1, "New Title", updated="2025-02-01T00:00:00Z")])
+
+    assert "old title" not in library.title_index
+    assert library.title_index["new title"] == [1]
+    assert library.watermarks["books"] == "2025-02-01T00:00:00Z"
+
+
+def test_get_highlights_by_filters_uses_tag_index():
+    library = LibraryCache()
+    library.apply_highlights(
+        [
+            make_highlight_json(1, 10, tags=["ai"], highlighted_at="2025-04-14T10:00:00Z"),
+            make_highlight_json(2, 10, tags=["history"], highlighted_at="2025-04-15T10:00:00Z"),
+            make_highlight_json(3, 11, tags=["ai"], highlighted_at="2025-05-01T10:00:00Z"),
+        ]
+    )
+
+    highlights = library.get_highlights_by_filters(date(2025, 4, 13), date(2025, 4, 20), ["ai"])
+
+    assert [h.id for h in highlights] == [1]
+
+
+def test_apply_highlights_updates_tag_and_book_indexes():
+    library = LibraryCache()
+    library.apply_highlights([make_highlight_json(1, 10, tags=["ai"])])
+    assert [h.id for h in library.get_highlights_by_book(10)] == [1]
+
+    library.apply_highlights([make_highlight_json(1, 11, tags=["history"])])
+
+    assert "ai" not in library.tag_index
+    assert library.tag_index["history"] == [1]
+    assert library.get_highlights_by_book(10) == []
+    assert [h.id for h in library.get_highlights_by_book(11)] == [1]
+
+
+def test_get_highlights_by_filters_requires_a_filter():
+    with pytest.raises(ValueError, match="At least one filter"):
+        LibraryCache().get_highlights_by_filters(None, None, [])
+
+
+@pytest.mark.asyncio
+async def test_sync_only_requests_delta_after_watermark(monkeypatch):
+    requests = []
+
+    async def fake_iter_records(api_key, url, params=None):
+        requests.append((url, params))
+        if url.endswith("/books/"):
+            yield make_book_json(1, "Deep Work", updated="2025-03-01T00:00:00Z")
+
+    async def fake_get_count(api_key, url):
+        return 1
+
+    monkeypatch.setattr(library_module, "iter_records", fake_iter_records)
+    monkeypatch.setattr(library_module, "get_count", fake_get_count)
+
+    library = LibraryCache(watermarks={"books": "2025-01-01T00:00:00Z"}, full_synced_at={"books": time.time()})
+    changed = await library.sync("api-key")
+
+    assert changed
+    assert requests[0][1]["updated__gt"] == "2025-01-01T00:00:00Z"
+    assert not requests[1][1]
+    assert library.watermarks["books"] == "2025-03-01T00:00:00Z"
+
+    # A second sync within the sync interval does not hit the API
+    assert not await library.sync("api-key")
+    assert len(requests) == 2
+
+
+def fake_api(monkeypatch, books: list, requests: list) -> None:
+    """Serve `books` from the /books/ endpoint of the library module, recording the requests."""
+
+    async def fake_iter_records(api_key, url, params=None):
+        requests.append(params or {})
+        if url.endswith("/books/"):
+            for book in books:
+                if not params or book["updated"] > params["updated__gt"]:
+                    yield book
+
+    async def fake_get_count(api_key, url):
+        return len(books) if url.endswith("/books/") else 0
+
+    monkeypatch.setattr(library_module, "iter_records", fake_iter_records)
+    monkeypatch.setattr(library_module, "get_count", fake_get_count)
+
+
+@pytest.mark.asyncio
+async def test_sync_drops_deleted_records_when_counts_differ(monkeypatch):
+    books = [make_book_json(1, "Deep Work"), make_book_json(2, "Sapiens")]
+    requests = []
+    fake_api(monkeypatch, books, requests)
+    library = LibraryCache()
+    await library.sync("api-key", endpoints=("books",))
+    assert requests == [{}]
+
+    del books[0]
+    books.append(make_book_json(3, "Slow Productivity", updated="2025-02-01T00:00:00Z"))
+    assert await library.sync("api-key", endpoints=("books",), force=True)
+    # The delta only has the new book, but the counts still differ: the deleted book is found by a full sync
+    assert requests[1:] == [{"updated__gt": "2025-01-01T00:00:00Z"}, {}]
+    assert sorted(library.books) == [2, 3]
+    assert library.find_books_by_titles(["Deep Work"])["Deep Work"] is None
+
+    assert not await library.sync("api-key", endpoints=("books",), force=True)
+    assert len(requests) == 4
+
+
+@pytest.mark.asyncio
+async def test_sync_runs_full_sync_once_the_last_one_is_too_old(monkeypatch):
+    books = [make_book_json(1, "Deep Work")]
+    requests = []
+    fake_api(monkeypatch, books, requests)
+    library = LibraryCache()
+    library.apply_books([make_book_json(2, "Sapiens")])
+    library.full_synced_at["books"] = time.time() - library_module.FULL_SYNC_INTERVAL_IN_SECONDS
+
+    assert await library.sync("api-key", endpoints=("books",))
+
+    assert requests == [{}]
+    assert list(library.books) == [1]
+    assert library.full_synced_at["books"] > time.time() - 60
+
+
+def test_find_books_by_titles_falls_back_to_fuzzy_match():
+    library = LibraryCache()
+    library.apply_books(
+        [make_book_json(1, "Thinking, Fast and Slow", author="Daniel Kahneman"), make_book_json(2, "Deep Work")]
+    )
+
+    results = library.find_books_by_titles(["Thinking Fast and Slow", "Something Else Entirely"])
+
+    assert results["Thinking Fast and Slow"].id == 1
+    assert results["Something Else Entirely"] is None
+
+
+def test_find_books_by_titles_does_not_resolve_partial_names():
+    library = LibraryCache()
+    library.apply_books(
+        [
+            make_book_json(1, "The Art of War", author="Sun Tzu"),
+            make_book_json(2, "Deep Work", author="Cal Newport"),
+            make_book_json(3, "Thinking, Fast and Slow", author="Daniel Kahneman"),
+            make_book_json(4, "Sapiens: A Brief History of Humankind", author="Yuval Noah Harari"),
+        ]
+    )
+
+    results = library.find_books_by_titles(["The", "Art", "Cal Newport", "Slow", "Sapiens", "Deep Wrk"])
+
+    assert [name for name, book in results.items() if book is not None] == ["Sapiens", "Deep Wrk"]
+    assert results["Sapiens"].id == 4
+    assert results["Deep Wrk"].id == 2
+    # Searching still ranks partial names
+    assert library.search_books("Cal Newport")[0].book.id == 2
+
+
+@pytest.mark.asyncio
+async def test_build_fuzzy_index_indexes_books_updated_meanwhile(monkeypatch):
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work"), make_book_json(2, "Sapiens")])
+
+    async def to_thread(function, *args):
+        index = function(*args)
+        # Updated while the index is being built
+        library.apply_books([make_book_json(1, "Slow Productivity")])
+        del library.books[2]
+        return index
+
+    monkeypatch.setattr(asyncio, "to_thread", to_thread)
+    await library.build_fuzzy_index()
+
+    assert library.search_books("Slow Productivity")[0].book.id == 1
+    assert library.search_books("Deep Work", min_score=0.5) == []
+    assert library.search_books("Sapiens", min_score=0.5) == []
+
+
+def test_search_books_follows_book_updates():
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Sapiens: A Brief History of Humankind")])
+    assert library.search_books("Sapiens")[0].book.id == 1
+
+    library.apply_books([make_book_json(1, "Homo Deus: A Brief History of Tomorrow")])
+    library.apply_books([make_book_json(2, "Sapiens")])
+
+    matches = library.search_books("Sapiens")
+    assert matches[0].book.id == 2
+    assert matches[0].score == 1.0
@@ -0,0 +1,128 @@
+# Standard Library
+import zlib
+
+# Third Party
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache import snapshot as snapshot_module
+from readwise_mcp.cache.library import LibraryCache
+from readwise_mcp.cache.snapshot import load_snapshot, save_snapshot, save_snapshot_in_background
+from tests.readwise_mcp.factories import make_book_json, make_highlight_json
+
+
+def test_snapshot_round_trip(tmp_path):
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work", updated="2025-03-01T00:00:00Z")])
+    library.apply_highlights([make_highlight_json(5, 1, tags=["focus"], updated="2025-03-02T00:00:00Z")])
+    library.full_synced_at["books"] = 1700000000.0
+    path = str(tmp_path / "library.snapshot")
+
+    save_snapshot(library, path)
+    restored = load_snapshot(path)
+
+    assert restored is not None
+    assert restored.watermarks == {"books": "2025-03-01T00:00:00Z", "highlights": "2025-03-02T00:00:00Z"}
+    assert restored.full_synced_at == {"books": 1700000000.0, "highlights": None}
+    assert restored.find_books_by_titles(["Deep Work"])["Deep Work"].id == 1
+    assert restored.tag_index == {"focus": [5]}
+    assert [h.id for h in restored.get_highlights_by_book(1)] == [5]
+
+
+def test_snapshot_sections_are_loaded_lazily(tmp_path):
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work")])
+    path = str(tmp_path / "library.snapshot")
+    save_snapshot(library, path)
+
+    restored = load_snapshot(path)
+    restored.find_books_by_titles(["Deep Work"])
+
+    assert "highlights" in restored._loaders
+    assert "tag_index" in restored._loaders
+
+
+def test_load_snapshot_ignores_missing_and_corrupt_files(tmp_path):
+    assert load_snapshot(str(tmp_path / "missing.snapshot")) is None
+
+    corrupt = tmp_path / "corrupt.snapshot"
+    corrupt.write_bytes(b"not a snapshot")
+    assert load_snapshot(str(corrupt)) is None
+
+    empty = tmp_path / "empty.snapshot"
+    empty.write_bytes(b"")
+    assert load_snapshot(str(empty)) is None
+
+
+def test_load_snapshot_deletes_truncated_snapshot(tmp_path):
+    library = LibraryCache()
+    library.apply_highlights([make_highlight_json(5, 1, tags=["focus"])])
+    path = tmp_path / "library.snapshot"
+    save_snapshot(library, str(path))
+    path.write_bytes(path.read_bytes()[:-5])
+
+    assert load_snapshot(str(path)) is None
+    assert not path.exists()
+
+
+def test_undecodable_section_discards_library_and_snapshot(tmp_path, monkeypatch):
+    library = LibraryCache()
+    library.apply_highlights([make_highlight_json(5, 1, tags=["focus"], updated="2025-03-02T00:00:00Z")])
+    path = tmp_path / "library.snapshot"
+    save_snapshot(library, str(path))
+    restored = load_snapshot(str(path))
+    restored._last_synced_at["highlights"] = 0.0
+
+    def fail(name, blob):
+        raise zlib.error("Error -5 while decompressing data")
+
+    monkeypatch.setattr(snapshot_module, "_decode_section", fail)
+
+    assert restored.tag_index == {}
+    # The failure does not leave the section missing for later accesses
+    assert restored.tag_index == {}
+    assert restored.watermarks == {"books": None, "highlights": None}
+    assert restored._last_synced_at == {}
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_save_snapshot_in_background_snapshots_a_copy(tmp_path):
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work")])
+    path = str(tmp_path / "library.snapshot")
+
+    await save_snapshot_in_background(library, path)
+    library.apply_books([make_book_json(2, "Sapiens")])
+
+    restored = load_snapshot(path)
+    assert list(restored.books) == [1]
+    assert restored.title_index == {"deep work": [1]}
+
+
+@pytest.mark.asyncio
+async def test_save_snapshot_in_background_keeps_unloaded_sections_encoded(tmp_path, monkeypatch):
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work")])
+    library.apply_highlights([make_highlight_json(5, 1, tags=["focus"])])
+    path = str(tmp_path / "library.snapshot")
+    save_snapshot(library, path)
+
+    restored = load_snapshot(path)
+    restored.apply_books([make_book_json(2, "Sapiens")])
+    decoded = []
+    decode_section = snapshot_module._decode_section
+    monkeypatch.setattr(
+        snapshot_module, "_decode_section", lambda name, blob: decoded.append(name) or decode_section(name, blob)
+    )
+
+    await save_snapshot_in_background(restored, path)
+
+    # Only the books and title index were touched by the update
+    assert decoded == []
+    assert "highlights" not in restored._sections
+    monkeypatch.undo()
+    reloaded = load_snapshot(path)
+    assert sorted(reloaded.books) == [1, 2]
+    assert list(reloaded.highlights) == [5]
+    assert reloaded.tag_index == {"focus": [5]}
@@ -0,0 +1,75 @@
+# Internal Libraries
+from readwise_mcp.cache.trigram import TrigramIndex, normalize, trigrams
+
+
+def build_index() -> TrigramIndex:
+    index = TrigramIndex()
+    for book_id, title, author in [
+        (1, "Thinking, Fast and Slow", "Daniel Kahneman"),
+        (2, "Sapiens: A Brief History of Humankind", "Yuval Noah Harari"),
+        (3, "Slow Productivity", "Cal Newport"),
+    ]:
+        index.add(book_id, title, f"{title} {author}")
+    return index
+
+
+def test_normalize_strips_case_accents_and_punctuation():
+    assert normalize("Thinking, Fast and Slow") == "thinking fast and slow"
+    assert normalize("  Café   Society!  ") == "cafe society"
+    assert normalize("Война и мир") == "воина и мир"
+
+
+def test_trigrams_pad_words():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+    assert trigrams("!!!") == frozenset()
+
+
+def test_search_ignores_punctuation():
+    assert build_index().search("Thinking Fast and Slow", limit=1) == [(1, 1.0)]
+
+
+def test_search_ranks_title_without_subtitle_first():
+    (book_id, score), *_ = build_index().search("Sapiens")
+
+    assert book_id == 2
+    assert score > 0.5
+
+
+def test_search_matches_author():
+    (book_id, _), *_ = build_index().search("thinking fast slow kahneman")
+
+    assert book_id == 1
+
+
+def test_search_applies_limit_and_min_score():
+    index = build_index()
+
+    assert len(index.search("slow", limit=1)) == 1
+    assert index.search("completely unrelated words", min_score=0.5) == []
+    assert index.search("") == []
+
+
+def test_add_replaces_and_remove_deletes_entries():
+    index = build_index()
+
+    index.add(3, "Deep Work")
+    assert index.search("Slow Productivity", min_score=0.5) == []
+    assert index.search("Deep Work", limit=1) == [(3, 1.0)]
+
+    index.remove(3)
+    assert index.search("Deep Work", min_score=0.5) == []
+    assert len(index) == 2
+
+
+def test_match_compares_names_by_similarity():
+    index = TrigramIndex()
+    index.add(1, "Sapiens: A Brief History of Humankind", "Sapiens", "Sapiens Yuval Noah Harari", num_names=2)
+    index.add(2, "Slow Productivity", "Slow Productivity Cal Newport")
+
+    assert index.match("Sapiens", min_similarity=0.5) == (1, 1.0)
+    book_id, similarity = index.match("Slow Productvity", min_similarity=0.5)
+    assert book_id == 2 and similarity < 1
+    # Neither a single word nor the author is similar to a name
+    assert index.match("Slow", min_similarity=0.5) is None
+    assert index.match("Cal Newport", min_similarity=0.5) is None
+    assert index.match("", min_similarity=0.5) is None
@@ -0,0 +1,53 @@
+# Standard Library
+from typing import Dict, List, Optional
+
+
+def make_book_json(
+    book_id: int,
+    title: str,
+    author: str = "Anonymous",
+    category: str = "books",
+    updated: str = "2025-01-01T00:00:00Z",
+    last_highlight_at: str = "2025-01-01T00:00:00Z",
+) -> Dict:
+    """Build a raw book record shaped like the Readwise /books/ API results."""
+    return {
+        "id": book_id,
+        "title": title,
+        "author": author,
+        "category": category,
+        "source": "kindle",
+        "num_highlights": 1,
+        "last_highlight_at": last_highlight_at,
+        "updated": updated,
+        "cover_image_url": "https://example.com/cover.png",
+        "highlights_url": f"https://readwise.io/bookreview/{book_id}",
+        "source_url": None,
+        "asin": None,
+        "tags": [],
+        "document_note": "",
+    }
+
+
+def make_highlight_json(
+    highlight_id: int,
+    book_id: int,
+    text: str = "Some highlighted text",
+    tags: Optional[List[str]] = None,
+    highlighted_at: Optional[str] = "2025-01-01T00:00:00Z",
+    updated: str = "2025-01-01T00:00:00Z",
+) -> Dict:
+    """Build a raw highlight record shaped like the Readwise /highlights/ API results."""
+    return {
+        "id": highlight_id,
+        "text": text,
+        "note": "",
+        "location": 1,
+        "location_type": "order",
+        "highlighted_at": highlighted_at,
+        "url": None,
+        "color": "yellow",
+        "updated": updated,
+        "book_id": book_id,
+        "tags": [{"id": index, "name": name} for index, name in enumerate(tags or [])],
+    }
@@ -0,0 +1,151 @@
+# Standard Library
+import asyncio
+import gzip
+
+# Third Party
+import httpx
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache.backends import SQLiteCacheBackend
+from readwise_mcp.tools.readwise import common
+from readwise_mcp.tools.readwise.common import get_data, response_cache_key
+from readwise_mcp.utils import json_codec
+
+URL = "https://readwise.io/api/v2/books/"
+
+
+def counting_transport(calls: list) -> httpx.MockTransport:
+    """Transport recording the requests it receives and answering them after a short delay."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"results": [{"id": len(calls)}], "next": None})
+
+    return httpx.MockTransport(handler)
+
+
+def test_response_cache_key_is_stable_and_namespaced():
+    key = response_cache_key("tenant", URL, {"page_size": 50, "category": "books"})
+
+    assert key == response_cache_key("tenant", URL, {"category": "books", "page_size": 50})
+    assert key.startswith("tenant:")
+    assert response_cache_key("tenant", f"{URL}?page=2") != response_cache_key("tenant", URL)
+
+
+@pytest.mark.asyncio
+async def test_get_data_caches_responses_per_tenant(mock_readwise):
+    calls = []
+    mock_readwise(counting_transport(calls))
+
+    first = await get_data("key-a", URL, {"page_size": 50})
+    second = await get_data("key-a", URL, {"page_size": 50})
+    other_tenant = await get_data("key-b", URL, {"page_size": 50})
+
+    assert first == second
+    assert other_tenant != first
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_fetch_a_key_only_once(mock_readwise, tmp_path):
+    calls = []
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+    mock_readwise(counting_transport(calls), response_cache=backend)
+
+    results = await asyncio.gather(*(get_data("key-a", URL) for _ in range(5)))
+
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+
+    backend.close()
+
+
+def paginated_transport(records: list, requests: list) -> httpx.MockTransport:
+    """Transport paginating `records` with the page and page_size query parameters, like the Readwise API."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page_size = int(request.url.params["page_size"])
+        page = int(request.url.params.get("page", 1))
+        requests.append((page, page_size))
+        start = (page - 1) * page_size
+        has_next = start + page_size < len(records)
+        body = {
+            "count": len(records),
+            "next": f"{URL}?page={page + 1}&page_size={page_size}" if has_next else None,
+            "results": records[start : start + page_size],
+        }
+        return httpx.Response(200, json=body)
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.fixture(params=[True, False], ids=["streamed", "buffered"])
+def stream_pages(monkeypatch, request):
+    # Pages are parsed incrementally or decoded at once depending on the installed JSON backends
+    monkeypatch.setattr(common, "STREAM_PAGES", request.param)
+
+
+@pytest.mark.asyncio
+async def test_iter_records_adapts_page_size_without_skipping_records(mock_readwise, stream_pages):
+    records = [{"id": record_id} for record_id in range(3000)]
+    requests = []
+    mock_readwise(paginated_transport(records, requests))
+
+    fetched = [record async for record in common.iter_records("key-a", URL, {"category": "books"})]
+
+    assert fetched == records
+    assert requests[0] == (1, 100)
+    assert max(page_size for _, page_size in requests) == 1000
+    assert len(requests) < len(records) / 100
+
+
+@pytest.mark.asyncio
+async def test_iter_records_serves_repeated_walks_from_the_cache(monkeypatch, mock_readwise, stream_pages):
+    records = [{"id": record_id} for record_id in range(150)]
+    requests = []
+    registry = mock_readwise(paginated_transport(records, requests))
+    tenant = await registry.get("key-a")
+    tenant.page_sizer(httpx.URL(URL).path).page_size = 50
+    # Keep the page size stable so that both walks request the same pages
+    monkeypatch.setattr(tenant.page_sizer(httpx.URL(URL).path), "observe", lambda *args: None)
+
+    first = [record async for record in common.iter_records("key-a", URL)]
+    second = [record async for record in common.iter_records("key-a", URL)]
+
+    assert first == second == records
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_records_retries_failed_pages(mock_readwise, stream_pages):
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(500, text="Server error")
+        return httpx.Response(200, json={"count": 1, "next": None, "results": [{"id": 1}]})
+
+    mock_readwise(httpx.MockTransport(handler))
+
+    assert [record async for record in common.iter_records("key-a", URL)] == [{"id": 1}]
+    assert len(attempts) == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_records_decodes_compressed_pages(mock_readwise, stream_pages):
+    page = json_codec.dumps({"count": 2, "next": None, "results": [{"id": 1}, {"id": 2}]})
+    accept_encodings = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        accept_encodings.append(request.headers["Accept-Encoding"])
+        return httpx.Response(200, content=gzip.compress(page), headers={"Content-Encoding": "gzip"})
+
+    mock_readwise(httpx.MockTransport(handler))
+
+    assert [record async for record in common.iter_records("key-a", URL)] == [{"id": 1}, {"id": 2}]
+    assert "gzip" in accept_encodings[0]
+    # The page is cached as the decompressed body, as received
+    assert [value for _, value in common.RESPONSE_CACHE._entries.values()] == [page]
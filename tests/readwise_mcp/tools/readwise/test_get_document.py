@@ -1,9 +1,15 @@
+# Standard Library
+import asyncio
+from datetime import date
+
 # Third Party
+import httpx
 import pytest
 
 # Internal Libraries
-from readwise_mcp.tools.readwise.get_document import get_documents_by_names
-from readwise_mcp.types.book import Book
+from readwise_mcp.tools.readwise.get_document import get_documents_by_names, list_documents_by_filters
+from readwise_mcp.types.book import Book, BookCategory
+from tests.readwise_mcp.factories import make_book_json
 
 
 @pytest.mark.asyncio
@@ -53,3 +59,41 @@ async def test_get_mixed_existing_and_non_existing(readwise_api_key):
     non_existing_name = "This Also Does Not Exist 67890"
     assert non_existing_name in results
     assert results[non_existing_name] is None
+
+
+@pytest.mark.asyncio
+async def test_list_documents_by_filters_fetches_categories_concurrently(mock_readwise):
+    books = [
+        make_book_json(1, "Deep Work", category="books", last_highlight_at="2025-03-01T00:00:00Z"),
+        make_book_json(2, "Attention Is All You Need", category="articles", last_highlight_at="2025-04-01T00:00:00Z"),
+        make_book_json(3, "Sapiens", category="books", last_highlight_at="2025-05-01T00:00:00Z"),
+        make_book_json(4, "Lex Fridman #400", category="podcasts", last_highlight_at="2025-06-01T00:00:00Z"),
+    ]
+    in_flight, max_in_flight, categories = 0, 0, []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        category = request.url.params["category"]
+        categories.append(category)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        results = [book for book in books if book["category"] == category]
+        return httpx.Response(200, json={"count": len(results), "next": None, "results": results})
+
+    mock_readwise(httpx.MockTransport(handler))
+
+    documents = await list_documents_by_filters(
+        "key-a", {BookCategory.BOOKS, BookCategory.ARTICLES, "books"}, from_date=date(2025, 1, 1)
+    )
+
+    assert sorted(categories) == ["articles", "books"]
+    assert max_in_flight == 2
+    assert [document.id for document in documents] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_list_documents_by_filters_rejects_invalid_category():
+    with pytest.raises(ValueError, match="Invalid category"):
+        await list_documents_by_filters("key-a", {"novels"})
@@ -0,0 +1,36 @@
+# Internal Libraries
+from readwise_mcp.tools.readwise.pagination import INITIAL_PAGE_SIZE, PAGE_SIZES, PageSizer
+
+
+def test_page_size_grows_one_step_at_a_time_when_pages_are_fast_and_small():
+    sizer = PageSizer()
+    sizes = []
+    for _ in range(5):
+        sizer.observe(num_records=sizer.page_size, num_bytes=sizer.page_size * 500, seconds=0.2)
+        sizes.append(sizer.page_size)
+
+    assert sizes == [200, 500, 1000, 1000, 1000]
+
+
+def test_page_size_shrinks_when_pages_are_slow():
+    sizer = PageSizer(initial_page_size=1000)
+
+    sizer.observe(num_records=1000, num_bytes=500_000, seconds=20)
+
+    assert sizer.page_size == 100
+
+
+def test_page_size_shrinks_when_payloads_are_large():
+    sizer = PageSizer(initial_page_size=1000)
+
+    sizer.observe(num_records=1000, num_bytes=50 * 1024 * 1024, seconds=0.5)
+
+    assert sizer.page_size == PAGE_SIZES[0]
+
+
+def test_empty_pages_are_ignored():
+    sizer = PageSizer()
+
+    sizer.observe(num_records=0, num_bytes=50, seconds=0.1)
+
+    assert sizer.page_size == INITIAL_PAGE_SIZE
@@ -0,0 +1,113 @@
+# Standard Library
+import time
+
+# Third Party
+import httpx
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache.backends import InMemoryCacheBackend
+from readwise_mcp.tools.readwise import common
+from readwise_mcp.tools.readwise.common import get_data
+from readwise_mcp.tools.readwise.tenants import RateLimiter, TenantRegistry, tenant_namespace
+
+
+def echo_token_transport() -> httpx.MockTransport:
+    """Transport answering every request with the token it was sent with."""
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={"token": request.headers["Authorization"]}))
+
+
+@pytest.mark.asyncio
+async def test_get_data_uses_the_tenant_of_each_api_key(mock_readwise):
+    registry = mock_readwise(echo_token_transport())
+
+    assert await get_data("key-a", "https://readwise.io/api/v2/books/") == {"token": "Token key-a"}
+    assert await get_data("key-b", "https://readwise.io/api/v2/books/") == {"token": "Token key-b"}
+    assert len(registry) == 2
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_tenants_have_isolated_clients_and_caches():
+    registry = TenantRegistry(transport=echo_token_transport())
+
+    tenant_a = await registry.get("key-a")
+    tenant_b = await registry.get("key-b")
+    tenant_a.cache["library"] = "library-a"
+
+    assert tenant_a is await registry.get("key-a")
+    assert tenant_a.client is not tenant_b.client
+    assert tenant_a.rate_limiter is not tenant_b.rate_limiter
+    assert "library" not in tenant_b.cache
+    assert tenant_a.namespace == tenant_namespace("key-a")
+    assert "key-a" not in tenant_a.namespace
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_idle_tenants_are_evicted():
+    registry = TenantRegistry(idle_timeout=60, transport=echo_token_transport())
+    idle_tenant = await registry.get("key-a")
+    idle_tenant.last_used_at = time.monotonic() - 120
+
+    await registry.get("key-b")
+
+    assert len(registry) == 1
+    assert idle_tenant.client.is_closed
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_tenants_are_evicted_above_the_limit():
+    registry = TenantRegistry(max_tenants=2, transport=echo_token_transport())
+    first_tenant = await registry.get("key-a")
+    await registry.get("key-b")
+    await registry.get("key-c")
+
+    assert len(registry) == 2
+    assert first_tenant.client.is_closed
+
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_evicted_tenants_lose_their_cached_responses(mock_readwise):
+    cache = InMemoryCacheBackend()
+    registry = mock_readwise(echo_token_transport(), response_cache=cache, idle_timeout=60)
+    idle_tenant = await registry.get("key-a")
+    await cache.set(f"{idle_tenant.namespace}:books", b"{}", ttl=60)
+    await cache.set(f"{tenant_namespace('key-b')}:books", b"{}", ttl=60)
+    idle_tenant.last_used_at = time.monotonic() - 120
+
+    await registry.get("key-b")
+
+    assert await cache.get(f"{idle_tenant.namespace}:books") is None
+    assert await cache.get(f"{tenant_namespace('key-b')}:books") == b"{}"
+
+    await registry.aclose()
+
+
+def test_default_registry_drops_the_cached_responses_of_evicted_tenants():
+    assert common.TENANTS.on_evict is common.drop_cached_responses
+
+
+@pytest.mark.asyncio
+async def test_registry_requires_an_api_key():
+    with pytest.raises(ValueError, match="API key is required"):
+        await TenantRegistry().get("")
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests_after_the_burst():
+    limiter = RateLimiter(requests_per_minute=600, burst=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        await limiter.acquire()
+    elapsed = time.monotonic() - start
+
+    # 2 requests from the burst, then 2 more at 10 requests per second
+    assert 0.15 <= elapsed < 0.5
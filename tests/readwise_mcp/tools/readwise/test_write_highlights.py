@@ -0,0 +1,160 @@
+# Standard Library
+import json
+
+# Third Party
+import httpx
+import pytest
+
+# Internal Libraries
+from readwise_mcp.cache.backends import InMemoryCacheBackend
+from readwise_mcp.cache.library import LibraryCache
+from readwise_mcp.tools.readwise import common
+from readwise_mcp.tools.readwise.tenants import tenant_namespace
+from readwise_mcp.tools.readwise.write_highlights import (
+    batch_indexes,
+    chain_batches,
+    create_highlights,
+    update_highlight_tags,
+)
+from readwise_mcp.types.highlight import NewHighlight
+from readwise_mcp.types.tag import TagOperation
+from tests.readwise_mcp.factories import make_book_json, make_highlight_json
+
+
+def test_batch_indexes_bounds_count_and_size():
+    highlights_json = [{"text": "a" * 10}] * 5 + [{"text": "b" * 100}] + [{"text": "c"}]
+
+    batches = batch_indexes(highlights_json, max_highlights=3, max_bytes=70)
+
+    assert batches == [[0, 1, 2], [3, 4], [5], [6]]
+
+
+def test_chain_batches_serializes_batches_of_the_same_new_document():
+    highlights_json = [
+        {"text": "a", "title": "Deep Work"},
+        {"text": "b", "title": "Sapiens"},
+        {"text": "c", "title": "Deep Work"},
+        {"text": "d", "title": "Slow Productivity"},
+        {"text": "e", "title": "Sapiens"},
+    ]
+    batches = [[0], [1], [2], [3], [4]]
+
+    assert chain_batches(batches, highlights_json) == [[[0], [2]], [[1], [4]], [[3]]]
+
+    library = LibraryCache()
+    library.apply_books([make_book_json(1, "Deep Work")])
+    assert chain_batches(batches, highlights_json, library) == [[[0]], [[1], [4]], [[2]], [[3]]]
+
+
+@pytest.mark.asyncio
+async def test_create_highlights_isolates_invalid_highlights(mock_readwise):
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        texts = [highlight["text"] for highlight in json.loads(request.content)["highlights"]]
+        batches.append(texts)
+        if "poison" in texts:
+            return httpx.Response(400, json={"detail": "Invalid highlight"})
+        return httpx.Response(200, json=[])
+
+    mock_readwise(httpx.MockTransport(handler))
+    highlights = [NewHighlight(text=f"quote {i}") for i in range(7)]
+    highlights[5] = NewHighlight(text="poison")
+
+    results = await create_highlights("key-a", highlights, max_highlights_per_batch=8)
+
+    assert [result.success for result in results] == [True] * 5 + [False, True]
+    assert "Invalid highlight" in results[5].error
+    # The batch is split in halves until the invalid highlight is alone
+    assert len(batches) == 7
+    assert batches[-1] == ["quote 6"]
+
+
+@pytest.mark.asyncio
+async def test_create_highlights_reports_per_item_results(mock_readwise):
+    batches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        highlights = json.loads(request.content)["highlights"]
+        batches.append([highlight["text"] for highlight in highlights])
+        if any(highlight["text"] == "poison" for highlight in highlights):
+            return httpx.Response(400, json={"detail": "Invalid highlight"})
+        titles = {highlight.get("title") for highlight in highlights}
+        return httpx.Response(200, json=[{"id": 10 + len(title), "title": title} for title in titles if title])
+
+    response_cache = InMemoryCacheBackend()
+    mock_readwise(httpx.MockTransport(handler), response_cache=response_cache)
+    await response_cache.set(f"{tenant_namespace('key-a')}:stale", b"{}", 60)
+    library = LibraryCache()
+    library._last_synced_at = {"books": 0.0, "highlights": 0.0}
+
+    highlights = [NewHighlight(text=f"quote {i}", title="Deep Work") for i in range(4)]
+    highlights.append(NewHighlight(text="poison"))
+
+    results = await create_highlights("key-a", highlights, library=library, max_highlights_per_batch=2)
+
+    assert sorted(batches) == [["poison"], ["quote 0", "quote 1"], ["quote 2", "quote 3"]]
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert [result.success for result in results] == [True, True, True, True, False]
+    assert results[0].book_id == 19
+    assert "Invalid highlight" in results[4].error
+    assert await response_cache.get(f"{tenant_namespace('key-a')}:stale") is None
+    assert library._last_synced_at == {}
+
+
+@pytest.mark.asyncio
+async def test_update_highlight_tags_applies_operations_in_order(monkeypatch, mock_readwise):
+    tags = {1: [{"id": 100, "name": "ai"}], 2: []}
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        highlight_id = int(request.url.path.split("/")[4])
+        if request.method == "GET":
+            return httpx.Response(200, json={"count": 1, "next": None, "results": tags[highlight_id]})
+        if request.method == "POST":
+            tag = {"id": 200 + highlight_id, "name": json.loads(request.content)["name"]}
+            tags[highlight_id].append(tag)
+            return httpx.Response(201, json=tag)
+        tag_id = int(request.url.path.split("/")[6])
+        tags[highlight_id] = [tag for tag in tags[highlight_id] if tag["id"] != tag_id]
+        return httpx.Response(204)
+
+    response_cache = InMemoryCacheBackend()
+    mock_readwise(httpx.MockTransport(handler), response_cache=response_cache)
+    invalidated = []
+    delete_prefix = response_cache.delete_prefix
+
+    async def count_delete_prefix(prefix: str) -> None:
+        invalidated.append(prefix)
+        await delete_prefix(prefix)
+
+    monkeypatch.setattr(response_cache, "delete_prefix", count_delete_prefix)
+    library = LibraryCache()
+    library.apply_highlights([make_highlight_json(1, 10, tags=["ai"])])
+
+    results = await update_highlight_tags(
+        "key-a",
+        [
+            TagOperation(highlight_id=1, tag_name="ai"),
+            TagOperation(highlight_id=1, tag_name="history"),
+            TagOperation(highlight_id=2, tag_name="ai", action="remove"),
+            TagOperation(highlight_id=1, tag_name="ai", action="remove"),
+        ],
+        library=library,
+    )
+
+    assert [result.success for result in results] == [True, True, False, True]
+    assert results[1].tag.name == "history"
+    assert "has no tag 'ai'" in results[2].error
+    # The existing tag is not added again
+    assert [method for method, _ in requests].count("POST") == 1
+    assert ("DELETE", "/api/v2/highlights/1/tags/100") in requests
+    assert tags[1] == [{"id": 201, "name": "history"}]
+    assert "ai" not in library.tag_index
+    assert library.tag_index["history"] == [1]
+    # The cached responses are invalidated once, not once per write
+    assert invalidated == [f"{tenant_namespace('key-a')}:"]
+    # The tags of all highlights share a single page sizer
+    tenant = await common.TENANTS.get("key-a")
+    assert list(tenant.page_sizers) == ["/api/v2/highlights/{id}/tags/"]
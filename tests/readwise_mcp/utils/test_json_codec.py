@@ -0,0 +1,39 @@
+# Third Party
+import pytest
+
+# Internal Libraries
+from readwise_mcp.utils import json_codec
+
+DOCUMENT = {"count": 1, "next": None, "results": [{"id": 1, "text": 'Café — "quoted"', "tags": []}]}
+
+
+def test_backend_is_known():
+    assert json_codec.BACKEND in {"orjson", "msgspec", "json"}
+
+
+def test_round_trip():
+    encoded = json_codec.dumps(DOCUMENT)
+
+    assert isinstance(encoded, bytes)
+    assert json_codec.loads(encoded) == DOCUMENT
+    assert json_codec.loads(encoded.decode("utf-8")) == DOCUMENT
+
+
+def test_stdlib_fallback_matches_backend():
+    encoded = json_codec._stdlib_dumps(DOCUMENT)
+
+    assert json_codec._stdlib_loads(encoded) == json_codec.loads(encoded)
+    assert json_codec.loads(json_codec.dumps(DOCUMENT)) == json_codec._stdlib_loads(encoded)
+
+
+def test_invalid_json_raises_value_error():
+    with pytest.raises(ValueError):
+        json_codec.loads(b'{"count": ')
+
+
+def test_loads_page_matches_loads():
+    encoded = json_codec.dumps(DOCUMENT)
+
+    assert json_codec.loads_page(encoded) == json_codec.loads(encoded)
+    with pytest.raises(ValueError):
+        json_codec.loads_page(b'{"count": ')
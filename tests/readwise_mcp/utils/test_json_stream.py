@@ -0,0 +1,75 @@
+# Standard Library
+import json
+
+# Third Party
+import pytest
+
+# Internal Libraries
+from readwise_mcp.utils.json_stream import JSONStreamParser
+
+PAGE = {
+    "count": 3,
+    "next": "https://readwise.io/api/v2/highlights/?page=2",
+    "previous": None,
+    "results": [
+        {"id": 1, "text": 'Café — "quoted" {braces} [brackets]', "tags": []},
+        {"id": 2, "text": "Second", "tags": [{"id": 7, "name": "ai"}]},
+        {"id": 3, "text": "Third", "location": 12345},
+    ],
+}
+
+
+def parse_in_chunks(data: bytes, chunk_size: int):
+    parser = JSONStreamParser("results")
+    records = []
+    for i in range(0, len(data), chunk_size):
+        records.extend(parser.feed(data[i : i + chunk_size]))
+    return records, parser.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 100_000])
+def test_records_and_envelope_are_parsed_for_any_chunking(chunk_size):
+    data = json.dumps(PAGE, ensure_ascii=False, indent=1).encode("utf-8")
+
+    records, envelope = parse_in_chunks(data, chunk_size)
+
+    assert records == PAGE["results"]
+    assert envelope == {"count": 3, "next": PAGE["next"], "previous": None}
+
+
+def test_results_before_other_fields():
+    page = {"results": [{"id": 1}], "count": 1, "next": None}
+
+    records, envelope = parse_in_chunks(json.dumps(page).encode("utf-8"), 3)
+
+    assert records == [{"id": 1}]
+    assert envelope == {"count": 1, "next": None}
+
+
+def test_records_are_returned_as_soon_as_they_are_complete():
+    parser = JSONStreamParser("results")
+
+    assert parser.feed(b'{"count": 2, "results": [{"id": 1}, {"id"') == [{"id": 1}]
+    assert parser.feed(b": 2}]}") == [{"id": 2}]
+    assert parser.close() == {"count": 2}
+    assert parser.count == 2
+
+
+def test_numbers_split_across_chunks_are_not_truncated():
+    records, envelope = parse_in_chunks(b'{"count": 1e3, "results":[1, 350.0, -2.5e-1, true]}', 1)
+
+    assert records == [1, 350.0, -0.25, True]
+    assert envelope == {"count": 1000.0}
+
+
+def test_truncated_document_raises():
+    parser = JSONStreamParser("results")
+    parser.feed(b'{"count": 2, "results": [{"id": 1}, {"id": 2')
+
+    with pytest.raises(ValueError, match="Incomplete"):
+        parser.close()
+
+
+def test_non_object_document_raises():
+    with pytest.raises(ValueError, match="Expected a JSON object"):
+        JSONStreamParser("results").feed(b"[1, 2]")
@@ -0,0 +1,135 @@
+# Standard Library
+import subprocess
+import sys
+
+# Third Party
+import pytest
+
+
+def test_importing_server_defers_tool_modules():
+    script = (
+        "import sys, server; "
+        "print(sorted(name for name in server.TOOL_MODULES + ('readwise_mcp.tools.readwise.common',) "
+        "if name in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_warm_up_imports_tool_modules():
+    script = (
+        "import asyncio, sys, server; "
+        "server.READWISE_API_KEY = None; "
+        "loaded = lambda: sorted(name for name in server.TOOL_MODULES if name in sys.modules); "
+        "before = loaded(); "
+        "asyncio.run(server.warm_up()); "
+        "print(before, loaded() == sorted(server.TOOL_MODULES))"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[] True"
+
+
+@pytest.fixture
+def http_request(monkeypatch):
+    # Internal Libraries
+    import server
+
+    headers = {}
+    monkeypatch.setattr(server, "get_http_request", lambda: object())
+    monkeypatch.setattr(server, "get_http_headers", lambda include_all=False: headers)
+    monkeypatch.setattr(server, "READWISE_API_KEY", "operator-key")
+    return headers
+
+
+def test_get_api_key_reads_key_header(http_request):
+    # Internal Libraries
+    import server
+
+    http_request.update({"x-readwise-api-key": "key-a", "authorization": "Token key-b"})
+
+    assert server.get_api_key() == "key-a"
+
+
+def test_get_api_key_reads_authorization_header(http_request):
+    # Internal Libraries
+    import server
+
+    http_request["authorization"] = "Token key-b"
+
+    assert server.get_api_key() == "key-b"
+
+
+def test_get_api_key_rejects_http_requests_without_key(http_request):
+    # Internal Libraries
+    import server
+
+    http_request["authorization"] = "Bearer key-b"
+
+    with pytest.raises(ValueError, match="No Readwise API key"):
+        server.get_api_key()
+
+
+def test_get_api_key_falls_back_over_http_when_allowed(http_request, monkeypatch):
+    # Internal Libraries
+    import server
+
+    monkeypatch.setattr(server, "READWISE_ALLOW_DEFAULT_KEY_OVER_HTTP", True)
+
+    assert server.get_api_key() == "operator-key"
+
+
+def test_get_api_key_falls_back_over_stdio(monkeypatch):
+    # Internal Libraries
+    import server
+
+    monkeypatch.setattr(server, "READWISE_API_KEY", "operator-key")
+
+    assert server.get_api_key() == "operator-key"
+
+    monkeypatch.setattr(server, "READWISE_API_KEY", None)
+    with pytest.raises(ValueError, match="READWISE_API_KEY"):
+        server.get_api_key()
+
+
+@pytest.mark.asyncio
+async def test_find_documents_by_names_only_walks_all_documents_for_inexact_names(monkeypatch, mock_readwise):
+    # Third Party
+    import httpx
+
+    # Internal Libraries
+    import server
+    from tests.readwise_mcp.factories import make_book_json
+
+    books = [make_book_json(book_id, f"Book {book_id}") for book_id in range(1, 250)] + [
+        make_book_json(250, "Deep Work")
+    ]
+    requested_pages = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page_size = int(request.url.params["page_size"])
+        page = int(request.url.params.get("page", 1))
+        requested_pages.append(page)
+        start = (page - 1) * page_size
+        body = {
+            "count": len(books),
+            "next": "next" if start + page_size < len(books) else None,
+            "results": books[start : start + page_size],
+        }
+        return httpx.Response(200, json=body)
+
+    registry = mock_readwise(httpx.MockTransport(handler))
+    monkeypatch.setattr(server, "READWISE_SNAPSHOT_DIR", None)
+    monkeypatch.setattr(server, "READWISE_API_KEY", "key-a")
+
+    results = await server.find_readwise_documents_by_names(["book 2"])
+
+    assert results["book 2"].id == 2
+    assert requested_pages == [1]
+    assert "library" not in (await registry.get("key-a")).cache
+
+    results = await server.find_readwise_documents_by_names(["Deep Wrk"])
+
+    assert results["Deep Wrk"].id == 250
+    assert "library" in (await registry.get("key-a")).cache